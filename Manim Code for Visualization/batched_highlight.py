@@ -0,0 +1,209 @@
+from manim import *
+import numpy as np
+
+
+def pad_index(groups):
+    """Turn a list of index lists into a (n_steps, width) int array padded with -1."""
+    width = max([len(g) for g in groups] + [1])
+    index = np.full((len(groups), width), -1, dtype=int)
+    for i, g in enumerate(groups):
+        index[i, :len(g)] = g
+    return index
+
+
+def color_style(color, opacity):
+    """Style dict equivalent to `.set_color(color).set_opacity(opacity)`."""
+    return {"fill_color": color, "fill_opacity": opacity,
+            "stroke_color": color, "stroke_opacity": opacity}
+
+
+def _box_corners(mobjects, index, buff):
+    # Bounding box of every step's mobjects, computed for all steps at once
+    if len(mobjects) == 0:
+        return np.full((len(index), 3), np.inf), np.full((len(index), 3), -np.inf)
+    lo = np.array([m.get_corner(DL) for m in mobjects])
+    hi = np.array([m.get_corner(UR) for m in mobjects])
+    valid = (index >= 0)[..., None]
+    safe = np.where(index >= 0, index, 0)
+    lo = np.where(valid, lo[safe], np.inf).min(axis=1) - buff
+    hi = np.where(valid, hi[safe], -np.inf).max(axis=1) + buff
+    return lo, hi
+
+
+def _get_style(mob):
+    return (mob.get_fill_color(), mob.get_fill_opacity(),
+            mob.get_stroke_color(), mob.get_stroke_opacity())
+
+
+def _target_style(start, style):
+    if style is None:
+        return start
+    fc, fo, sc, so = start
+    return (ManimColor(style.get("fill_color", fc)), style.get("fill_opacity", fo),
+            ManimColor(style.get("stroke_color", sc)), style.get("stroke_opacity", so))
+
+
+def _set_style(mob, a, b, t):
+    mob.set_fill(interpolate_color(a[0], b[0], t), opacity=a[1] + (b[1] - a[1]) * t)
+    mob.set_stroke(interpolate_color(a[2], b[2], t), opacity=a[3] + (b[3] - a[3]) * t)
+
+
+def _progress(s, start, end):
+    if end <= start:
+        return 1.0 if s >= end else 0.0
+    return float(np.clip((s - start) / (end - start), 0, 1))
+
+
+class HighlightSweep(Animation):
+    """
+    Play a whole per-store highlight loop as a single animation.
+
+    Step k highlights dots[dot_index[k]] and cells[cell_index[k]] (-1 entries
+    are padding), draws a bounding box around each set, cross-fades to
+    captions[k] and reveals reveals[k]. Every step runs through the phases the
+    loop used to play one by one, with durations given by `timing`:
+    highlight (boxes drawn, styles ramped to the highlight style), hold, box
+    fade-out, and reset (styles ramped to the reset style).
+
+    Only the mobjects of the active step are touched on a frame, so a sweep
+    over hundreds of stores costs one `play` call instead of several per store.
+    """
+
+    def __init__(
+        self,
+        dots,
+        cells,
+        dot_index,
+        cell_index,
+        captions=None,
+        reveals=None,
+        dot_styles=(None, None),
+        cell_styles=(None, None),
+        timing=(1.0, 0.0, 0.5, 0.0),
+        box_buff=(0.1, 0.1),
+        box_color=BLUE,
+        box_rate=smooth,
+        **kwargs,
+    ):
+        self.dots = list(dots)
+        self.cells = list(cells)
+        self.dot_index = np.asarray(dot_index, dtype=int)
+        self.cell_index = np.asarray(cell_index, dtype=int)
+        self.n_steps = len(self.dot_index)
+        self.captions = list(captions) if captions is not None else [None] * self.n_steps
+        self.reveals = list(reveals) if reveals is not None else [None] * self.n_steps
+        self.dot_styles = dot_styles
+        self.cell_styles = cell_styles
+        # Ends of the highlight, hold, fade and reset phases within a step
+        self.phase_ends = np.cumsum(timing)
+        self.step_time = float(self.phase_ends[-1])
+        self.box_rate = box_rate
+
+        self.box_corners = [
+            _box_corners(self.dots, self.dot_index, box_buff[0]),
+            _box_corners(self.cells, self.cell_index, box_buff[1]),
+        ]
+        self.boxes = VGroup(Rectangle(color=box_color), Rectangle(color=box_color))
+        self.box_templates = [None, None]
+        self.caption_holder = VGroup()
+        self.revealed = VGroup()
+
+        self.step = -1
+        self.start_styles = []
+        self.current_caption = None
+        self.previous_caption = None
+
+        group = VGroup(VGroup(*self.dots), VGroup(*self.cells), self.boxes,
+                       self.caption_holder, self.revealed)
+        kwargs.setdefault("run_time", self.n_steps * self.step_time)
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(group, **kwargs)
+
+    def create_starting_mobject(self):
+        # The sweep never reads its starting state, so skip copying every dot
+        return Mobject()
+
+    def _setup_scene(self, scene):
+        super()._setup_scene(scene)
+        if scene is not None:
+            scene.add(self.boxes, self.caption_holder, self.revealed)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        scene.remove(self.boxes)
+
+    def _step_mobjects(self, k):
+        dots = [self.dots[i] for i in self.dot_index[k] if i >= 0]
+        cells = [self.cells[i] for i in self.cell_index[k] if i >= 0]
+        return (dots, self.dot_styles), (cells, self.cell_styles)
+
+    def _enter_step(self, k):
+        # Remember where this step's dots and cells start so they can be ramped
+        self.start_styles = []
+        for mobs, (highlight, reset) in self._step_mobjects(k):
+            for mob in mobs:
+                start = _get_style(mob)
+                peak = _target_style(start, highlight)
+                end = _target_style(peak, reset)
+                self.start_styles.append((mob, start, peak, end))
+
+        for i, (lo, hi) in enumerate(self.box_corners):
+            if np.all(np.isfinite(lo[k])) and np.all(np.isfinite(hi[k])):
+                size = hi[k] - lo[k]
+                self.box_templates[i] = Rectangle(width=size[0], height=size[1]).move_to(
+                    (lo[k] + hi[k]) / 2
+                )
+            else:
+                self.box_templates[i] = None
+
+        self.previous_caption = self.current_caption
+        if self.captions[k] is not None:
+            self.current_caption = self.captions[k]
+            self.caption_holder.submobjects = [
+                c for c in (self.previous_caption, self.current_caption) if c is not None
+            ]
+        if self.reveals[k] is not None:
+            self.revealed.add(self.reveals[k])
+        self.step = k
+
+    def _update_step(self, s):
+        highlight_end, hold_end, fade_end, reset_end = self.phase_ends
+        a = smooth(_progress(s, 0, highlight_end))
+        f = smooth(_progress(s, hold_end, fade_end))
+        r = smooth(_progress(s, fade_end, reset_end))
+
+        for mob, start, peak, end in self.start_styles:
+            if r > 0:
+                _set_style(mob, peak, end, r)
+            else:
+                _set_style(mob, start, peak, a)
+
+        box_progress = self.box_rate(_progress(s, 0, highlight_end))
+        for box, template in zip(self.boxes, self.box_templates):
+            if template is None:
+                box.set_stroke(opacity=0)
+                continue
+            box.pointwise_become_partial(template, 0, box_progress)
+            box.set_stroke(opacity=1 - f)
+
+        caption = self.captions[self.step]
+        if caption is not None:
+            caption.set_opacity(a)
+            if self.previous_caption is not None and self.previous_caption is not caption:
+                self.previous_caption.set_opacity(1 - a)
+                if a >= 1:
+                    self.caption_holder.submobjects = [caption]
+        if self.reveals[self.step] is not None:
+            self.reveals[self.step].set_opacity(a)
+
+    def interpolate_mobject(self, alpha):
+        if self.n_steps == 0:
+            return
+        t = alpha * self.n_steps * self.step_time
+        k = min(int(t // self.step_time), self.n_steps - 1)
+        # Frames can skip over short steps; finish those before moving on
+        while self.step < k:
+            if self.step >= 0:
+                self._update_step(self.step_time)
+            self._enter_step(self.step + 1)
+        self._update_step(t - k * self.step_time)
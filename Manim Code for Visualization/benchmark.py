@@ -0,0 +1,168 @@
+"""
+Render performance regression benchmarks of the slide scenes.
+
+Renders every slide scene (USMapDemandScenarios, PlotGAFilteredPoints,
+DisplayTransformations, YearlyVisualization, ReferenceMatrix) at low quality
+on synthetic inputs (synthetic_data.py) of increasing size. Every render runs
+in a fresh process, one at a time, and records
+    peak_mobjects : most mobjects on screen after any play
+    play_calls    : play calls made by construct() (waits not included)
+    wall_time     : seconds spent in scene.render()
+    peak_rss_mb   : peak resident memory of the rendering process
+The results are compared with the baselines in benchmark_baselines.json. A
+metric that grows by more than its TOLERANCE over the baseline is reported as
+a regression, and the exit status is 1.
+
+Baselines are machine-specific (time and memory), so none are shipped. A
+scene and size without a baseline gets the measured result recorded as its
+baseline, which means the first run on a machine bootstraps the file.
+--update-baselines re-records every measured entry, e.g. after an intended
+scene change.
+
+Usage:
+    python benchmark.py                              # compare; record missing baselines
+    python benchmark.py --update-baselines           # re-record the baselines
+    python benchmark.py --sizes 50 500 --only slide4_DisplayTransformations
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from render_all import SEED, SLIDES_DIR, discover_scenes, load_scene_class
+from synthetic_data import write_synthetic_inputs
+
+SIZES = (50, 200, 1000)
+BASELINES = SLIDES_DIR / "benchmark_baselines.json"
+METRICS = ("peak_mobjects", "play_calls", "wall_time", "peak_rss_mb")
+# Relative growth over the baseline that counts as a regression. The counts
+# are deterministic on seeded synthetic data; time and memory are noisy.
+TOLERANCE = {"peak_mobjects": 0.10, "play_calls": 0.10, "wall_time": 0.50, "peak_rss_mb": 0.25}
+
+
+def bench_scene(path, scene_name, data_dir, media_dir, quality="low_quality"):
+    """Render one scene with the inputs in `data_dir` and return its metrics."""
+    from manim import tempconfig
+
+    from scene_probe import DryRunMixin
+
+    # The slides open their CSV/JSON inputs with relative paths
+    os.chdir(data_dir)
+    random.seed(SEED)
+    np.random.seed(SEED)
+    scene_cls = load_scene_class(path, scene_name)
+    bench_cls = type(scene_name, (DryRunMixin, scene_cls), {})
+    options = {
+        "quality": quality,
+        "media_dir": str(media_dir),
+        "progress_bar": "none",
+        "output_file": f"{Path(path).stem}_{scene_name}",
+    }
+    with tempconfig(options):
+        scene = bench_cls()
+        scene._reset_counters()
+        start = time.perf_counter()
+        scene.render()
+        wall_time = time.perf_counter() - start
+    return {
+        "peak_mobjects": scene.peak_mobjects,
+        "play_calls": scene.play_calls,
+        "wall_time": round(wall_time, 3),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def run_benchmarks(scenes, sizes=SIZES, n_projects=751, quality="low_quality"):
+    """Return {scene_key: {str(size): metrics}} for every scene at every size."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # A fresh interpreter per render, so peak RSS belongs to that render alone
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+            for size in sizes:
+                data_dir = Path(tmp) / f"data_{size}"
+                write_synthetic_inputs(data_dir, size, n_projects)
+                for path, name in scenes:
+                    key = f"{path.stem}_{name}"
+                    media_dir = Path(tmp) / f"media_{size}_{key}"
+                    metrics = pool.submit(bench_scene, path, name, data_dir, media_dir, quality).result()
+                    results.setdefault(key, {})[str(size)] = metrics
+                    print(f"{key} [{size} scenarios]: " + ", ".join(f"{m}={metrics[m]}" for m in METRICS))
+    return results
+
+
+def compare(results, baselines, tolerance=TOLERANCE):
+    """
+    List (scene, size, metric, baseline, value) for every metric that grew by
+    more than its tolerance, and the (scene, size) pairs with no baseline.
+    """
+    regressions, missing = [], []
+    for key, by_size in results.items():
+        for size, metrics in by_size.items():
+            base = baselines.get(key, {}).get(size)
+            if base is None:
+                missing.append((key, size))
+                continue
+            for metric in METRICS:
+                if metric in base and metrics[metric] > base[metric] * (1 + tolerance[metric]):
+                    regressions.append((key, size, metric, base[metric], metrics[metric]))
+    return regressions, missing
+
+
+def load_baselines(path=BASELINES):
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baselines(results, path=BASELINES):
+    """Merge `results` into the baselines file; scenes and sizes not measured are kept."""
+    baselines = load_baselines(path)
+    for key, by_size in results.items():
+        baselines.setdefault(key, {}).update(by_size)
+    Path(path).write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the slide scene renders against baselines.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="synthetic scenario counts to render with")
+    parser.add_argument("--projects", type=int, default=751)
+    parser.add_argument("--quality", default="low_quality")
+    parser.add_argument("--only", nargs="*", help="benchmark only these slideN_Scene keys")
+    parser.add_argument("--baselines", default=str(BASELINES))
+    parser.add_argument("--update-baselines", action="store_true",
+                        help="store the results as the new baselines")
+    args = parser.parse_args()
+
+    scenes = discover_scenes()
+    if args.only:
+        scenes = [(p, n) for p, n in scenes if f"{p.stem}_{n}" in args.only]
+
+    results = run_benchmarks(scenes, args.sizes, args.projects, args.quality)
+    if args.update_baselines:
+        save_baselines(results, args.baselines)
+        print(f"Baselines written to {args.baselines}")
+        return
+
+    regressions, missing = compare(results, load_baselines(args.baselines))
+    if missing:
+        save_baselines({key: {size: results[key][size]} for key, size in missing}, args.baselines)
+    for key, size in missing:
+        print(f"{key} [{size} scenarios]: no baseline, recorded this run as the baseline")
+    for key, size, metric, base, value in regressions:
+        print(f"REGRESSION {key} [{size} scenarios]: {metric} {base} -> {value}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
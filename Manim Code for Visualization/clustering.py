@@ -0,0 +1,362 @@
+"""
+Scenario clustering on the scenario x project matrix (slide5's K-means step).
+
+Scenarios that are identical after month encoding, existence masking and
+imputation are collapsed first: `dedup_rows` keeps one copy of every distinct
+row and counts its multiplicity. K-means, K-medoids and the metrics then run
+on the unique rows with those counts as weights, which gives the same
+clusters as running on every scenario while touching each distinct row once.
+With `n_components`, the unique rows are projected onto their top principal
+components (svd_projection.py) before clustering.
+
+`scenario_features` picks what the rows are: the imputed month codes of
+slide7's grid ("months") or cumulative opening curves per state
+("curves", "room_curves"; opening_curves.py), or weighted project
+features stacked with the month grid ("features"; features.py).
+
+Both algorithms take a warm start: prior centers (or medoid rows, as vectors)
+from an earlier run, e.g. with a different K or on a previous scenario drop.
+`adjust_centers` splits or merges clusters until the count matches K, and
+Lloyd / medoid iterations continue from there instead of from k-means++.
+
+Usage:
+    python clustering.py output_with_metropolitan.csv --k 10 --method kmedoids
+    python clustering.py output_with_metropolitan.csv --k 10 --components 32
+    python clustering.py output_with_metropolitan.csv --k 10 --metric curves
+    python clustering.py output_with_metropolitan.csv --k 20 --sweep
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from features import feature_tensor
+from opening_curves import curve_features
+from parallel_impute import parallel_impute
+from scenario_matrix import build_scenario_matrix, impute
+from svd_projection import PCAProjection
+
+# Rows per block when computing distances, so (block x K) stays small
+CHUNK = 4096
+
+# Scenario representations; Euclidean distance between rows is the metric
+FEATURES = {
+    "months": impute,
+    "raw_months": lambda matrix: matrix["months"],
+    "curves": curve_features,
+    "room_curves": lambda matrix: curve_features(matrix, "rooms"),
+    "features": feature_tensor,
+}
+
+
+def scenario_features(matrix, metric="months"):
+    """Rows to cluster for a `build_scenario_matrix` dict under `metric`."""
+    if metric not in FEATURES:
+        raise ValueError(f"unknown metric {metric!r}")
+    return FEATURES[metric](matrix)
+
+
+def dedup_rows(X):
+    """
+    Collapse identical rows of a 2-D array.
+    Returns (unique, weights, inverse): unique rows in order of first
+    appearance, how many input rows each stands for, and the unique row of
+    every input row (X == unique[inverse]).
+    """
+    X = np.ascontiguousarray(X)
+    # Compare whole packed rows as single opaque values
+    packed = X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).ravel()
+    _, first, inverse, counts = np.unique(packed, return_index=True, return_inverse=True,
+                                          return_counts=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return X[first[order]], counts[order], rank[inverse.ravel()]
+
+
+def sq_distances(X, C):
+    """(len(X), len(C)) squared Euclidean distances."""
+    X = np.asarray(X, dtype=float)
+    C = np.asarray(C, dtype=float)
+    d = (X * X).sum(1)[:, None] - 2 * X @ C.T + (C * C).sum(1)[None, :]
+    return np.maximum(d, 0)
+
+
+def assign(X, C):
+    """Nearest center and its squared distance for every row, in blocks."""
+    labels = np.empty(len(X), dtype=np.int64)
+    dist = np.empty(len(X))
+    for start in range(0, len(X), CHUNK):
+        d = sq_distances(X[start:start + CHUNK], C)
+        labels[start:start + CHUNK] = d.argmin(1)
+        dist[start:start + CHUNK] = d[np.arange(len(d)), labels[start:start + CHUNK]]
+    return labels, dist
+
+
+def _weights(X, weights):
+    return np.ones(len(X)) if weights is None else np.asarray(weights, dtype=float)
+
+
+def kmeans_plus_plus(X, k, weights=None, seed=0):
+    """Weighted k-means++ seeding; returns row indices of the initial centers."""
+    rng = np.random.default_rng(seed)
+    w = _weights(X, weights)
+    chosen = [rng.choice(len(X), p=w / w.sum())]
+    closest = sq_distances(X, X[chosen]).ravel()
+    for _ in range(1, k):
+        p = w * closest
+        if p.sum() <= 0:
+            break
+        chosen.append(rng.choice(len(X), p=p / p.sum()))
+        closest = np.minimum(closest, sq_distances(X, X[chosen[-1:]]).ravel())
+    return np.array(chosen)
+
+
+def adjust_centers(X, centers, k, weights=None):
+    """
+    Bring prior centers to k clusters, one step at a time: split the
+    cluster with the largest weighted cost (its farthest member becomes a
+    new center) or merge the two closest centers into their weighted mean.
+    """
+    X = np.asarray(X, dtype=float)
+    w = _weights(X, weights)
+    centers = np.array(centers, dtype=float).reshape(-1, X.shape[1])
+    while len(centers) < k:
+        if len(centers) == 0:
+            centers = X[[int(np.argmax(w))]]
+            continue
+        labels, dist = assign(X, centers)
+        cost = np.bincount(labels, weights=w * dist, minlength=len(centers))
+        members = np.flatnonzero(labels == cost.argmax())
+        far = members[dist[members].argmax()]
+        if dist[far] == 0:
+            break
+        centers = np.vstack([centers, X[far]])
+    while len(centers) > k:
+        labels, _ = assign(X, centers)
+        mass = np.bincount(labels, weights=w, minlength=len(centers))
+        d = sq_distances(centers, centers)
+        np.fill_diagonal(d, np.inf)
+        i, j = np.unravel_index(d.argmin(), d.shape)
+        total = mass[i] + mass[j]
+        centers[i] = (mass[i] * centers[i] + mass[j] * centers[j]) / total if total > 0 \
+            else (centers[i] + centers[j]) / 2
+        centers = np.delete(centers, j, axis=0)
+    return centers
+
+
+def kmeans(X, k, weights=None, seed=0, n_iter=100, tol=1e-6, init=None):
+    """
+    Weighted Lloyd iterations, from k-means++ seeds or from the prior
+    centers `init` (adjusted to k). Returns (labels, centers, inertia),
+    inertia being the weighted sum of squared distances to the assigned center.
+    """
+    X = np.asarray(X, dtype=float)
+    w = _weights(X, weights)
+    if init is None:
+        centers = X[kmeans_plus_plus(X, k, w, seed)]
+    else:
+        centers = adjust_centers(X, init, k, w)
+    inertia = np.inf
+    for _ in range(n_iter):
+        labels, dist = assign(X, centers)
+        new_inertia = (w * dist).sum()
+        mass = np.bincount(labels, weights=w, minlength=len(centers))
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, w[:, None] * X)
+        # Empty clusters keep their previous center
+        filled = mass > 0
+        centers[filled] = sums[filled] / mass[filled, None]
+        if inertia - new_inertia <= tol * max(new_inertia, 1e-12):
+            inertia = new_inertia
+            break
+        inertia = new_inertia
+    labels, dist = assign(X, centers)
+    return labels, centers, (w * dist).sum()
+
+
+def centers_from_labels(X, labels, k, weights=None):
+    """Weighted mean of each cluster's rows; a warm start from prior assignments."""
+    X = np.asarray(X, dtype=float)
+    w = _weights(X, weights)
+    mass = np.bincount(labels, weights=w, minlength=k)
+    sums = np.zeros((k, X.shape[1]))
+    np.add.at(sums, labels, w[:, None] * X)
+    return sums[mass > 0] / mass[mass > 0, None]
+
+
+def medoids_of(X, labels, k, weights=None):
+    """
+    Row index of each cluster's medoid: the member with the smallest weighted
+    sum of distances to the other members. -1 for empty clusters.
+    """
+    X = np.asarray(X, dtype=float)
+    w = _weights(X, weights)
+    medoids = np.full(k, -1)
+    for c in range(k):
+        members = np.flatnonzero(labels == c)
+        if len(members) == 0:
+            continue
+        cost = np.zeros(len(members))
+        for start in range(0, len(members), CHUNK):
+            block = members[start:start + CHUNK]
+            cost[start:start + CHUNK] = np.sqrt(sq_distances(X[block], X[members])) @ w[members]
+        medoids[c] = members[cost.argmin()]
+    return medoids
+
+
+def kmedoids(X, k, weights=None, seed=0, n_iter=50, init=None):
+    """
+    Weighted alternating K-medoids (assign to the nearest medoid, re-pick
+    each cluster's medoid) with Euclidean distances. `init` holds prior
+    medoids as vectors; each adjusted one starts at its nearest row of X.
+    Returns (labels, medoids, cost), medoids being row indices of X.
+    """
+    X = np.asarray(X, dtype=float)
+    w = _weights(X, weights)
+    if init is None:
+        medoids = kmeans_plus_plus(X, k, w, seed)
+    else:
+        nearest, _ = assign(adjust_centers(X, init, k, w), X)
+        medoids = np.unique(nearest)
+    for _ in range(n_iter):
+        labels, _ = assign(X, X[medoids])
+        new = medoids_of(X, labels, len(medoids), w)
+        new = np.where(new < 0, medoids, new)
+        if np.array_equal(new, medoids):
+            break
+        medoids = new
+    labels, dist = assign(X, X[medoids])
+    return labels, medoids, (w * np.sqrt(dist)).sum()
+
+
+def inertia(X, labels, centers, weights=None):
+    """Weighted sum of squared distances to the assigned centers."""
+    X = np.asarray(X, dtype=float)
+    diff = X - np.asarray(centers, dtype=float)[labels]
+    return (_weights(X, weights) * (diff * diff).sum(1)).sum()
+
+
+def silhouette(X, labels, weights=None):
+    """
+    Weighted mean silhouette. Every row counts `weights` times, both as a
+    point and as a neighbor, so a deduplicated matrix scores like the full one.
+    """
+    X = np.asarray(X, dtype=float)
+    w = _weights(X, weights)
+    k = labels.max() + 1
+    mass = np.bincount(labels, weights=w, minlength=k)
+    scores = np.zeros(len(X))
+    for start in range(0, len(X), CHUNK):
+        d = np.sqrt(sq_distances(X[start:start + CHUNK], X))
+        # Weighted distance sum from each row to every cluster
+        per_cluster = np.zeros((len(d), k))
+        for c in range(k):
+            per_cluster[:, c] = d[:, labels == c] @ w[labels == c]
+        own = labels[start:start + CHUNK]
+        rows = np.arange(len(d))
+        # A row's copies sit at distance 0 from it, so only subtract the row itself
+        own_mass = mass[own] - 1
+        a = np.where(own_mass > 0, per_cluster[rows, own] / np.maximum(own_mass, 1e-12), 0)
+        other = per_cluster / np.where(mass > 0, mass, np.inf)
+        other[rows, own] = np.inf
+        b = other.min(1)
+        s = np.where(own_mass > 0, (b - a) / np.maximum(np.maximum(a, b), 1e-12), 0)
+        scores[start:start + CHUNK] = s
+    return (w * scores).sum() / w.sum()
+
+
+def reduce_scenarios(X, k, method="kmeans", seed=0, dedup=True, n_components=None, warm=None):
+    """
+    Cluster the scenario rows of X into k groups and pick one representative
+    scenario per group, optionally in an `n_components`-dimensional PCA space.
+    `warm` is an earlier result on the same columns (any K, any scenario
+    drop); its centers seed this run and its PCA projection is reused.
+
+    Returns a dict with
+        labels          : cluster of every scenario row
+        representatives : row of X chosen for each cluster (its medoid)
+        probabilities   : share of scenarios in each cluster
+        cost            : K-means inertia or K-medoids cost
+        n_unique        : distinct rows clustered
+        projection      : the fitted PCAProjection, or None
+        centers         : cluster centers (medoid rows for K-medoids), in
+                          the space that was clustered
+    """
+    X = np.asarray(X)
+    if dedup:
+        unique, weights, inverse = dedup_rows(X)
+    else:
+        unique, weights, inverse = X, np.ones(len(X), dtype=np.int64), np.arange(len(X))
+    unique = unique.astype(float)
+    k = min(k, len(unique))
+    projection = None
+    if warm is not None and warm["projection"] is not None:
+        projection = warm["projection"]
+        unique = projection.transform(unique).astype(float)
+    elif n_components:
+        projection = PCAProjection(n_components, seed=seed)
+        unique = projection.fit_transform(unique, weights).astype(float)
+    init = None if warm is None else warm["centers"]
+
+    if method == "kmeans":
+        labels, centers, cost = kmeans(unique, k, weights, seed, init=init)
+        medoids = medoids_of(unique, labels, k, weights)
+    elif method == "kmedoids":
+        labels, medoids, cost = kmedoids(unique, k, weights, seed, init=init)
+        centers = unique[medoids]
+    else:
+        raise ValueError(f"unknown clustering method {method!r}")
+
+    # Map unique rows back to the first scenario row they stand for
+    first_row = np.full(len(unique), -1)
+    first_row[inverse[::-1]] = np.arange(len(X))[::-1]
+    return {
+        "labels": labels[inverse],
+        "representatives": np.where(medoids >= 0, first_row[np.maximum(medoids, 0)], -1),
+        "probabilities": np.bincount(labels, weights=weights, minlength=k) / weights.sum(),
+        "cost": cost,
+        "n_unique": len(unique),
+        "projection": projection,
+        "centers": centers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster the scenarios of a scenario CSV.")
+    parser.add_argument("csv")
+    parser.add_argument("--k", type=int, default=2)
+    parser.add_argument("--method", choices=["kmeans", "kmedoids"], default="kmeans")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--metric", choices=sorted(FEATURES), default="months")
+    parser.add_argument("--workers", type=int, help="impute in this many processes")
+    parser.add_argument("--components", type=int, help="cluster in this many PCA dimensions")
+    parser.add_argument("--sweep", action="store_true",
+                        help="report the cost for every K up to --k, each run warm-started")
+    args = parser.parse_args()
+
+    matrix = build_scenario_matrix(pd.read_csv(args.csv))
+    if args.metric == "months" and args.workers:
+        X = parallel_impute(matrix, args.workers)
+    else:
+        X = scenario_features(matrix, args.metric)
+    if args.sweep:
+        result = None
+        for k in range(1, args.k + 1):
+            result = reduce_scenarios(X, k, args.method, args.seed, n_components=args.components,
+                                      warm=result)
+            print(f"K={k}: cost {result['cost']:.4g}")
+        return
+    result = reduce_scenarios(X, args.k, args.method, args.seed, n_components=args.components)
+    print(f"{len(X)} scenarios, {result['n_unique']} distinct, cost {result['cost']:.4g}")
+    if result["projection"] is not None:
+        ratio = result["projection"].explained_variance_ratio.sum()
+        print(f"{args.components} components explain {ratio:.1%} of the variance")
+    for c, (rep, p) in enumerate(zip(result["representatives"], result["probabilities"])):
+        # -1 marks a cluster that ended up empty; it has no representative
+        scenario = "empty" if rep < 0 else f"scenario {matrix['scenarios'][rep]}"
+        print(f"    cluster {c}: {scenario}, probability {p:.3f}")
+
+
+if __name__ == "__main__":
+    main()
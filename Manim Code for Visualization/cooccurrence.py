@@ -0,0 +1,115 @@
+"""
+Which projects happen together across scenarios?
+
+slide5 walks store by store through the scenarios to show that. Here the
+existence matrix is bit-packed per project (one bit per scenario, 64 per
+word). The co-occurrence count of two projects is then an AND plus a
+popcount over S / 64 words. From the counts come the phi correlation
+between projects and groups of co-moving projects (K-means on correlation
+profiles). `group_columns` replaces each group's columns by one, which
+shrinks the matrix before scenario clustering.
+
+Usage:
+    python cooccurrence.py output_with_metropolitan.csv --groups 20
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from clustering import kmeans
+from scenario_matrix import build_scenario_matrix
+
+# Projects per block of the pairwise AND, so (block x P x words) stays small
+BLOCK = 64
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _BYTE_BITS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return _BYTE_BITS[words.view(np.uint8)].reshape(words.shape + (8,)).sum(-1)
+
+
+def pack_columns(exists):
+    """(P, ceil(S / 64)) uint64 bitsets, one per project column of an (S, P) bool matrix."""
+    exists = np.asarray(exists, dtype=bool)
+    bits = np.packbits(exists.T, axis=1)
+    pad = -bits.shape[1] % 8
+    bits = np.pad(bits, ((0, 0), (0, pad)))
+    return np.ascontiguousarray(bits).view(np.uint64)
+
+
+def cooccurrence(exists):
+    """(P, P) number of scenarios in which both projects happen; the diagonal counts each."""
+    words = pack_columns(exists)
+    P = len(words)
+    counts = np.empty((P, P), dtype=np.int64)
+    for start in range(0, P, BLOCK):
+        both = words[start:start + BLOCK, None, :] & words[None, :, :]
+        counts[start:start + BLOCK] = _popcount(both).sum(axis=2)
+    return counts
+
+
+def phi_correlation(counts, n_scenarios):
+    """Pearson correlation of the existence columns, from co-occurrence counts."""
+    n = np.diag(counts).astype(float)
+    var = n * (n_scenarios - n)
+    num = n_scenarios * counts - np.outer(n, n)
+    denom = np.sqrt(np.outer(var, var))
+    # Projects that happen in all or no scenarios do not co-vary with anything
+    return np.divide(num, denom, out=np.zeros_like(num, dtype=float), where=denom > 0)
+
+
+def project_groups(corr, n_groups, seed=0):
+    """Group projects whose correlation profiles are alike; one label per project."""
+    labels, _, _ = kmeans(corr, n_groups, seed=seed)
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels.ravel()
+
+
+def group_columns(X, groups, reduce="mean"):
+    """
+    (S, n_groups) matrix with one column per project group: the mean
+    ("mean") or sum ("sum") of the group's columns in X.
+    """
+    X = np.asarray(X, dtype=float)
+    n_groups = groups.max() + 1
+    onehot = np.zeros((len(groups), n_groups))
+    onehot[np.arange(len(groups)), groups] = 1
+    out = X @ onehot
+    if reduce == "mean":
+        out /= onehot.sum(0)
+    return out
+
+
+def group_table(matrix, groups):
+    """One row per project group: its stores, states and size, in slide7's column order."""
+    return pd.DataFrame({
+        "group": groups,
+        "Store No.": matrix["stores"],
+        "State/Province": matrix["states"],
+    }).groupby("group").agg(
+        stores=("Store No.", list),
+        states=("State/Province", lambda s: sorted(set(s))),
+        size=("Store No.", "size"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project co-occurrence and co-moving groups.")
+    parser.add_argument("csv")
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    matrix = build_scenario_matrix(pd.read_csv(args.csv))
+    counts = cooccurrence(matrix["exists"])
+    corr = phi_correlation(counts, len(matrix["scenarios"]))
+    groups = project_groups(corr, args.groups, args.seed)
+    print(group_table(matrix, groups).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Incremental what-if updates of a K-means reduction.
+
+"Project X slips six months in these scenarios: does the reduced set change?"
+`DeltaReducer` keeps the imputed matrix, the cluster sums and masses, and the
+squared distance of every scenario to every center. A change to one project
+column:
+1. re-imputes only that column and its two neighbors (slide7's rule reads
+   one neighbor on each side, within the state segment),
+2. adds the per-column change to the cached distances and cluster sums,
+3. moves the scenarios whose nearest center changed, recomputing distances
+   only for the clusters that gained or lost members,
+and reports which scenarios moved and whether any representative changed.
+"""
+import numpy as np
+
+from clustering import kmeans, medoids_of, sq_distances
+from scenario_matrix import impute_rows, state_segments
+
+# Lloyd passes after a delta before giving up on full convergence
+MAX_PASSES = 10
+
+
+class DeltaReducer:
+    """K-means reduction of a scenario matrix that accepts per-project edits."""
+
+    def __init__(self, matrix, k, seed=0):
+        self.months = matrix["months"].copy()
+        self.lon = np.asarray(matrix["lon"], dtype=float)
+        self.segments = state_segments(matrix["states"])
+        self.column = {store: c for c, store in enumerate(matrix["stores"])}
+        self.X = impute_rows(self.months, self.lon, self.segments).astype(float)
+
+        self.labels, self.centers, _ = kmeans(self.X, k, seed=seed)
+        self.k = len(self.centers)
+        self.mass = np.bincount(self.labels, minlength=self.k).astype(float)
+        self.sums = np.zeros_like(self.centers)
+        np.add.at(self.sums, self.labels, self.X)
+        self.dist = sq_distances(self.X, self.centers)
+        self.medoids = medoids_of(self.X, self.labels, self.k)
+
+    def cost(self):
+        return self.dist[np.arange(len(self.X)), self.labels].sum()
+
+    def _update_centers(self, clusters, cols=None):
+        """Recompute centers of `clusters` from their sums and refresh their distances."""
+        clusters = np.asarray(clusters)
+        filled = clusters[self.mass[clusters] > 0]
+        old = self.centers[filled].copy()
+        self.centers[filled] = self.sums[filled] / self.mass[filled, None]
+        if cols is None:
+            self.dist[:, filled] = sq_distances(self.X, self.centers[filled])
+        else:
+            # Only `cols` of these centers moved: adjust the distances by the difference
+            x = self.X[:, cols][:, None, :]
+            new = ((x - self.centers[filled][:, cols][None]) ** 2).sum(2)
+            before = ((x - old[:, cols][None]) ** 2).sum(2)
+            self.dist[:, filled] += new - before
+
+    def set_months(self, store, scenarios, codes):
+        """
+        Give project `store` the month codes `codes` (0 = does not happen) in
+        the matrix rows `scenarios`; a row listed more than once takes its
+        last code. Returns a report dict:
+            changed : rows whose imputed vector changed
+            moved   : rows whose cluster changed
+            representatives_changed : whether any cluster's medoid changed
+        """
+        col = self.column[store]
+        rows = np.atleast_1d(np.asarray(scenarios))
+        codes = np.broadcast_to(codes, rows.shape)
+        # A repeated row would add its delta to the cluster sums once per copy
+        _, first_reversed = np.unique(rows[::-1], return_index=True)
+        last = len(rows) - 1 - first_reversed
+        rows, codes = rows[last], codes[last]
+        P = self.months.shape[1]
+        self.months[rows, col] = codes
+
+        # Imputed values of col - 1 .. col + 1 read months of col - 2 .. col + 2
+        lo, hi = max(col - 2, 0), min(col + 3, P)
+        cols = np.arange(max(col - 1, 0), min(col + 2, P))
+        window = impute_rows(self.months[np.ix_(rows, np.arange(lo, hi))], self.lon[lo:hi],
+                             self.segments[lo:hi])
+        new = window[:, cols - lo].astype(float)
+        old = self.X[np.ix_(rows, cols)]
+        delta = new - old
+        touched = np.any(delta != 0, axis=1)
+        rows, new, old, delta = rows[touched], new[touched], old[touched], delta[touched]
+        if len(rows) == 0:
+            return {"changed": rows, "moved": rows, "representatives_changed": False}
+
+        # Distances of the edited rows to every center, by the changed columns only
+        c = self.centers[:, cols][None]
+        self.dist[rows] += ((new[:, None] - c) ** 2).sum(2) - ((old[:, None] - c) ** 2).sum(2)
+        self.X[np.ix_(rows, cols)] = new
+        np.add.at(self.sums, (self.labels[rows][:, None], cols[None]), delta)
+        affected = np.unique(self.labels[rows])
+        self._update_centers(affected, cols)
+
+        moved_rows = []
+        for _ in range(MAX_PASSES):
+            best = self.dist.argmin(1)
+            moved = np.flatnonzero(best != self.labels)
+            if len(moved) == 0:
+                break
+            moved_rows.append(moved)
+            src, dst = self.labels[moved], best[moved]
+            np.add.at(self.sums, src, -self.X[moved])
+            np.add.at(self.sums, dst, self.X[moved])
+            np.add.at(self.mass, src, -1)
+            np.add.at(self.mass, dst, 1)
+            self.labels[moved] = dst
+            self._update_centers(np.union1d(src, dst))
+            affected = np.union1d(affected, np.union1d(src, dst))
+        moved = np.unique(np.concatenate(moved_rows)) if moved_rows else np.empty(0, dtype=np.int64)
+
+        # Only clusters whose members or values changed can have a new medoid
+        before = self.medoids.copy()
+        for a in affected:
+            members = np.flatnonzero(self.labels == a)
+            if len(members):
+                self.medoids[a] = members[medoids_of(self.X[members], np.zeros(len(members), int), 1)[0]]
+        lost = [c for c in range(self.k) if self.mass[c] == 0]
+        self.medoids[lost] = -1
+        return {
+            "changed": rows,
+            "moved": moved,
+            "representatives_changed": not np.array_equal(before, self.medoids),
+        }
+
+    def slip(self, store, months, scenarios=None):
+        """Delay project `store` by `months` in `scenarios` (default: every scenario it happens in)."""
+        col = self.column[store]
+        happens = np.flatnonzero(self.months[:, col] > 0)
+        rows = happens if scenarios is None else np.intersect1d(happens, scenarios)
+        return self.set_months(store, rows, self.months[rows, col] + months)
@@ -0,0 +1,194 @@
+"""
+Data-only dry run of the slide scenes.
+
+Runs every scene's construct() - data loading, mobject construction and the
+full animation plan - with animation skipping on, so no frame is rasterized,
+and with Tex/MathTex/Text swapped for size-matched placeholders, so no LaTeX
+is compiled. Reports play calls, mobject counts and the time spent in each
+function of the slide file (plot_points, create_cluster_matrix_rect_grid,
+highlight_and_transform, ...).
+
+Usage:
+    python dry_run.py                        # real inputs next to the slides
+    python dry_run.py --synthetic 1000       # 1000-scenario synthetic inputs
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+from manim import tempconfig
+
+from render_all import SEED, SLIDES_DIR, discover_scenes, load_scene_class
+from scene_probe import TEXT_CLASSES, DryRunMixin, PlaceholderTex
+from synthetic_data import write_synthetic_inputs
+
+
+class PhaseTimer:
+    """
+    Inclusive wall time per function of the slide file, nested helpers
+    included. On Python 3.12+ it uses sys.monitoring events enabled on those
+    code objects only, so manim and numpy code run at full speed. Older
+    versions fall back to sys.setprofile, which sees every call and slows the
+    run down, so the times are only comparable between runs of one version.
+    """
+
+    MONITORING = hasattr(sys, "monitoring")
+    if MONITORING:
+        TOOL = sys.monitoring.PROFILER_ID
+        EVENTS = sys.monitoring.events.PY_START | sys.monitoring.events.PY_RETURN
+
+    def __init__(self, module):
+        self.codes = [c for c in self._code_objects(module) if not c.co_name.startswith("<")]
+        self.code_set = set(self.codes)
+        self.times = {}
+        self.calls = {}
+        self.stack = []
+        self.depth = {}
+
+    @staticmethod
+    def _code_objects(module):
+        codes = []
+
+        def visit(code):
+            codes.append(code)
+            for const in code.co_consts:
+                if isinstance(const, types.CodeType):
+                    visit(const)
+
+        for obj in vars(module).values():
+            if isinstance(obj, types.FunctionType) and obj.__module__ == module.__name__:
+                visit(obj.__code__)
+            elif isinstance(obj, type) and obj.__module__ == module.__name__:
+                for attr in vars(obj).values():
+                    if isinstance(attr, types.FunctionType):
+                        visit(attr.__code__)
+        return codes
+
+    def _start(self, code, offset):
+        name = code.co_name
+        self.depth[name] = self.depth.get(name, 0) + 1
+        self.stack.append((name, time.perf_counter()))
+
+    def _return(self, code, offset, retval):
+        name, started = self.stack.pop()
+        self.depth[name] -= 1
+        self.calls[name] = self.calls.get(name, 0) + 1
+        # Recursive calls are already covered by the outermost one
+        if self.depth[name] == 0:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - started
+
+    def _unwind(self, code, offset, exc):
+        # A slide function exiting through an exception never reaches PY_RETURN
+        if code in self.code_set:
+            self._return(code, offset, None)
+
+    def _profile(self, frame, event, arg):
+        # "return" also fires when an exception leaves the frame
+        if frame.f_code in self.code_set:
+            if event == "call":
+                self._start(frame.f_code, frame.f_lasti)
+            elif event == "return":
+                self._return(frame.f_code, frame.f_lasti, arg)
+
+    def __enter__(self):
+        if not self.MONITORING:
+            sys.setprofile(self._profile)
+            return self
+        sys.monitoring.use_tool_id(self.TOOL, "dry_run")
+        sys.monitoring.register_callback(self.TOOL, sys.monitoring.events.PY_START, self._start)
+        sys.monitoring.register_callback(self.TOOL, sys.monitoring.events.PY_RETURN, self._return)
+        sys.monitoring.register_callback(self.TOOL, sys.monitoring.events.PY_UNWIND, self._unwind)
+        sys.monitoring.set_events(self.TOOL, sys.monitoring.events.PY_UNWIND)
+        for code in self.codes:
+            sys.monitoring.set_local_events(self.TOOL, code, self.EVENTS)
+        return self
+
+    def __exit__(self, *exc):
+        if not self.MONITORING:
+            sys.setprofile(None)
+            return
+        for code in self.codes:
+            sys.monitoring.set_local_events(self.TOOL, code, 0)
+        sys.monitoring.set_events(self.TOOL, 0)
+        sys.monitoring.register_callback(self.TOOL, sys.monitoring.events.PY_UNWIND, None)
+        sys.monitoring.register_callback(self.TOOL, sys.monitoring.events.PY_START, None)
+        sys.monitoring.register_callback(self.TOOL, sys.monitoring.events.PY_RETURN, None)
+        sys.monitoring.free_tool_id(self.TOOL)
+
+
+def dry_run_scene(path, scene_name):
+    """Dry-run one scene in the current directory and return its report."""
+    random.seed(SEED)
+    np.random.seed(SEED)
+    scene_cls = load_scene_class(path, scene_name)
+    module = sys.modules[scene_cls.__module__]
+    for name in TEXT_CLASSES:
+        if name in vars(module):
+            setattr(module, name, PlaceholderTex)
+    # PhaseTimer keeps one call stack, so the slide functions must all run on this thread
+    if hasattr(module, "PREFETCH"):
+        module.PREFETCH = False
+
+    dry_cls = type(scene_name, (DryRunMixin, scene_cls), {})
+    options = {"dry_run": True, "write_to_movie": False, "save_last_frame": False,
+               "progress_bar": "none"}
+    start = time.perf_counter()
+    with tempconfig(options), PhaseTimer(module) as timer:
+        scene = dry_cls(skip_animations=True)
+        scene._reset_counters()
+        scene.render()
+
+    return {
+        "scene": f"{Path(path).stem}_{scene_name}",
+        "play_calls": scene.play_calls,
+        "wait_calls": scene.wait_calls,
+        "animations": scene.animations,
+        "peak_mobjects": scene.peak_mobjects,
+        "final_mobjects": len(scene.get_mobject_family_members()),
+        "total_time": time.perf_counter() - start,
+        "phases": dict(sorted(timer.times.items(), key=lambda kv: -kv[1])),
+        "phase_calls": timer.calls,
+    }
+
+
+def print_report(report):
+    print(
+        f"{report['scene']}: {report['play_calls']} plays, {report['wait_calls']} waits, "
+        f"{report['animations']} animations, peak {report['peak_mobjects']} mobjects, "
+        f"{report['total_time']:.2f}s"
+    )
+    for name, seconds in report["phases"].items():
+        print(f"    {name:<45} {seconds:8.3f}s  x{report['phase_calls'][name]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dry-run the slide scenes without rendering.")
+    parser.add_argument("--data-dir", default=str(SLIDES_DIR))
+    parser.add_argument("--synthetic", type=int, metavar="N_SCENARIOS",
+                        help="generate synthetic inputs with this many scenarios")
+    parser.add_argument("--projects", type=int, default=751)
+    parser.add_argument("--only", nargs="*", help="run only these slideN_Scene keys")
+    args = parser.parse_args()
+
+    scenes = discover_scenes()
+    if args.only:
+        scenes = [(p, n) for p, n in scenes if f"{p.stem}_{n}" in args.only]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir
+        if args.synthetic:
+            data_dir = tmp
+            write_synthetic_inputs(tmp, args.synthetic, args.projects)
+        os.chdir(data_dir)
+        for path, name in scenes:
+            print_report(dry_run_scene(path, name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Weighted multi-feature rows for clustering.
+
+slide1 lists the project features behind a scenario: location, opening time,
+rooms, state, metropolitan flag. `FeatureBuilder` standardizes those project
+attributes once and stacks, per scenario,
+    months  : imputed opening months, standardized
+    exists  : which projects happen (0/1)
+    profile : the mean standardized attributes of the projects that happen,
+              one column per attribute (state as one column per state)
+each block scaled by its weight. The result is one contiguous float32
+(S, F) array for clustering.sq_distances. It is rebuilt only when the
+weights change.
+"""
+import numpy as np
+
+from scenario_matrix import impute
+
+DEFAULT_WEIGHTS = {
+    "months": 1.0,
+    "exists": 1.0,
+    "lat": 1.0,
+    "lon": 1.0,
+    "rooms": 1.0,
+    "state": 1.0,
+    "metropolitan": 1.0,
+}
+CACHE_KEY = "feature_builder"
+
+
+def _standardize(values):
+    values = np.asarray(values, dtype=float)
+    std = values.std()
+    return (values - values.mean()) / (std if std > 0 else 1.0)
+
+
+class FeatureBuilder:
+    """Standardized blocks of one scenario matrix, combined on demand with weights."""
+
+    def __init__(self, matrix, months=None):
+        months = impute(matrix) if months is None else months
+        exists = matrix["exists"]
+        n_projects = exists.shape[1]
+        # Scenarios with no projects get a zero (mean) profile
+        n_existing = np.maximum(exists.sum(axis=1, keepdims=True), 1)
+
+        opened = months[months > 0]
+        mean, std = (opened.mean(), opened.std()) if len(opened) else (0.0, 1.0)
+        # Absent projects that imputation could not fill sit at the mean
+        scaled = np.where(months > 0, (months - mean) / (std if std > 0 else 1.0), 0.0)
+
+        states, state_idx = np.unique(matrix["states"], return_inverse=True)
+        attributes = {
+            "lat": _standardize(matrix["lat"])[:, None],
+            "lon": _standardize(matrix["lon"])[:, None],
+            "rooms": _standardize(matrix["rooms"])[:, None],
+            "state": np.eye(len(states))[state_idx.ravel()],
+            "metropolitan": _standardize(matrix.get("metropolitan", np.zeros(n_projects)))[:, None],
+        }
+        self.blocks = {
+            "months": scaled.astype(np.float32),
+            "exists": exists.astype(np.float32),
+        }
+        for name, attr in attributes.items():
+            self.blocks[name] = (exists @ attr / n_existing).astype(np.float32)
+        self._weights = None
+        self._tensor = None
+
+    def build(self, weights=None):
+        """(S, F) float32 rows for `weights` (missing names use DEFAULT_WEIGHTS)."""
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(self.blocks)
+        if unknown:
+            raise ValueError(f"unknown feature blocks {sorted(unknown)}")
+        if weights == self._weights:
+            return self._tensor
+
+        names = [name for name in self.blocks if weights[name] != 0]
+        n_rows = len(self.blocks["months"])
+        tensor = np.empty((n_rows, sum(self.blocks[n].shape[1] for n in names)), dtype=np.float32)
+        col = 0
+        for name in names:
+            block = self.blocks[name]
+            np.multiply(block, np.float32(weights[name]), out=tensor[:, col:col + block.shape[1]])
+            col += block.shape[1]
+        self._weights, self._tensor = weights, tensor
+        return tensor
+
+
+def feature_tensor(matrix, weights=None):
+    """Weighted feature rows of a scenario matrix; the standardized blocks are cached in it."""
+    if CACHE_KEY not in matrix:
+        matrix[CACHE_KEY] = FeatureBuilder(matrix)
+    return matrix[CACHE_KEY].build(weights)
@@ -0,0 +1,221 @@
+"""
+Precomputed year-by-year reveal of project locations.
+
+Every unique (lat, lon) gets an integer ID once. For each scenario and year
+only the IDs that appear for the first time are stored, as one flat array
+with offsets, so the map reveal in slide1/slide2 is pure slicing instead of a
+per-point set lookup.
+
+Nothing upstream writes grouped_points.json, so this module also generates
+the reveal and stores it in a flat binary file: a JSON header indexing raw
+arrays by offset. The arrays are memory-mapped on load, so a scene for one
+scenario only pages in that scenario's slice of IDs and the locations it uses.
+
+Usage:
+    python grouped_points.py output_with_metropolitan.csv grouped_points.bin
+    python grouped_points.py grouped_points.json grouped_points.bin
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def build_reveal(scenario, year, lat, lon):
+    """
+    Build the reveal from parallel per-row arrays (one row per project
+    occurrence, any number of scenarios).
+
+    Returns a dict with
+        locations : (L, 2) unique (lat, lon) pairs, indexed by location ID
+        scenarios : sorted scenario numbers
+        years     : sorted years
+        ids       : location IDs, grouped by scenario then year
+        offsets   : (n_scenarios, n_years + 1); the IDs first seen in
+                    scenarios[s] during years[y] are ids[offsets[s, y]:offsets[s, y + 1]]
+    """
+    scenario = np.asarray(scenario)
+    year = np.asarray(year)
+    coords = np.column_stack([np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)])
+
+    locations, loc_id = np.unique(coords, axis=0, return_inverse=True)
+    scenarios, s_idx = np.unique(scenario, return_inverse=True)
+    years, y_idx = np.unique(year, return_inverse=True)
+    loc_id, s_idx, y_idx = loc_id.ravel(), s_idx.ravel(), y_idx.ravel()
+
+    # Walk rows in (scenario, year) order; the first row of every
+    # (scenario, location) pair is where that location appears
+    order = np.lexsort((y_idx, s_idx))
+    pair = s_idx[order].astype(np.int64) * len(locations) + loc_id[order]
+    _, first = np.unique(pair, return_index=True)
+    first = order[np.sort(first)]
+
+    # np.unique's first indices were sorted, so rows stay grouped by (scenario, year)
+    group = s_idx[first].astype(np.int64) * len(years) + y_idx[first]
+    bounds = np.searchsorted(group, np.arange(len(scenarios) * len(years) + 1))
+    offsets = np.empty((len(scenarios), len(years) + 1), dtype=np.int64)
+    offsets[:, :-1] = bounds[:-1].reshape(len(scenarios), len(years))
+    offsets[:, -1] = bounds[np.arange(1, len(scenarios) + 1) * len(years)]
+
+    return {
+        "locations": locations,
+        "scenarios": scenarios,
+        "years": years,
+        "ids": loc_id[first].astype(np.int32),
+        "offsets": offsets,
+    }
+
+
+def build_reveal_from_df(df):
+    """Reveal for every scenario of an output_with_metropolitan.csv-style frame."""
+    return build_reveal(df["Scenario"], df["year"], df["Lat"], df["Lon"])
+
+
+def load_grouped_points(file_path, scenario=0):
+    """
+    Reveal from grouped_points.json ({year: [[lat, lon(, state)], ...]}),
+    which only holds one scenario.
+    """
+    with open(file_path, "r") as f:
+        grouped_by_year = json.load(f)
+    years, lat, lon = [], [], []
+    for yr, positions in grouped_by_year.items():
+        coords = np.array([entry[:2] for entry in positions], dtype=float).reshape(-1, 2)
+        years.append(np.full(len(coords), int(yr)))
+        lat.append(coords[:, 0])
+        lon.append(coords[:, 1])
+    year = np.concatenate(years) if years else np.empty(0, dtype=int)
+    return build_reveal(np.full(len(year), scenario), year, np.concatenate(lat or [[]]),
+                        np.concatenate(lon or [[]]))
+
+
+MAGIC = b"GPTS0001"
+ALIGN = 64
+ARRAYS = ("locations", "scenarios", "years", "ids", "offsets")
+
+
+def write_arrays(arrays, file_path, magic=MAGIC):
+    """Write named arrays as [magic][header length][JSON header][aligned raw arrays]."""
+    # asarray rather than ascontiguousarray, which would turn 0-d arrays into 1-d
+    arrays = {name: np.asarray(arr, order="C") for name, arr in arrays.items()}
+    header = {}
+    offset = 0
+    for name, arr in arrays.items():
+        header[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset += -(-arr.nbytes // ALIGN) * ALIGN
+    header_bytes = json.dumps(header).encode()
+    data_start = -(-(len(magic) + 8 + len(header_bytes)) // ALIGN) * ALIGN
+
+    with open(file_path, "wb") as f:
+        f.write(magic)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for name, arr in arrays.items():
+            f.seek(data_start + header[name]["offset"])
+            f.write(arr.tobytes())
+        f.truncate(data_start + offset)
+
+
+def read_arrays(file_path, names=None, magic=MAGIC):
+    """
+    Memory-map the arrays of a file written by `write_arrays` (only `names`,
+    if given); nothing is read until sliced.
+    """
+    with open(file_path, "rb") as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError(f"{file_path} is not a {magic[:4].decode()} file")
+        header_len = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_len))
+    data_start = -(-(len(magic) + 8 + header_len) // ALIGN) * ALIGN
+
+    arrays = {}
+    for name in header if names is None else names:
+        spec = header[name]
+        shape = tuple(spec["shape"])
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype=spec["dtype"])
+        else:
+            arrays[name] = np.memmap(file_path, dtype=spec["dtype"], mode="r",
+                                     offset=data_start + spec["offset"], shape=shape)
+    return arrays
+
+
+def write_reveal(reveal, file_path):
+    """Write a reveal in the flat binary layout of `write_arrays`."""
+    write_arrays({name: reveal[name] for name in ARRAYS}, file_path)
+
+
+def read_reveal(file_path):
+    """Memory-map a reveal written by `write_reveal`."""
+    return read_arrays(file_path)
+
+
+def load_reveal(file_path, scenario=0):
+    """
+    Reveal from a binary file or a scenario CSV (all scenarios), or from
+    grouped_points.json (one scenario, labelled `scenario`).
+    """
+    suffix = Path(file_path).suffix
+    if suffix == ".bin":
+        return read_reveal(file_path)
+    if suffix == ".csv":
+        return build_reveal_from_df(pd.read_csv(file_path))
+    return load_grouped_points(file_path, scenario)
+
+
+# Inputs a missing binary file is rebuilt from, in order of preference
+REVEAL_SOURCES = ("output_with_metropolitan.csv", "grouped_points.json")
+
+
+def open_reveal(file_path="grouped_points.bin", scenario=0, sources=REVEAL_SOURCES):
+    """
+    Reveal from a binary file. When the file is missing it is built from the
+    first of `sources` found next to it and written, so later loads are
+    memory-mapped again.
+    """
+    file_path = Path(file_path)
+    if not file_path.exists():
+        for source in sources:
+            source = file_path.with_name(source)
+            if source.exists():
+                write_reveal(load_reveal(source, scenario), file_path)
+                break
+        else:
+            raise FileNotFoundError(
+                f"{file_path} is missing and there is no {' or '.join(sources)} to build it from"
+            )
+    return read_reveal(file_path)
+
+
+def new_location_ids(reveal, scenario, year):
+    """Location IDs that appear for the first time in `scenario` during `year`."""
+    s = np.searchsorted(reveal["scenarios"], scenario)
+    y = np.searchsorted(reveal["years"], year)
+    if (s >= len(reveal["scenarios"]) or reveal["scenarios"][s] != scenario
+            or y >= len(reveal["years"]) or reveal["years"][y] != year):
+        return reveal["ids"][:0]
+    return reveal["ids"][reveal["offsets"][s, y]:reveal["offsets"][s, y + 1]]
+
+
+def new_locations(reveal, scenario, year):
+    """(k, 2) lat/lon of the locations first seen in `scenario` during `year`."""
+    return reveal["locations"][new_location_ids(reveal, scenario, year)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the binary year-by-year reveal.")
+    parser.add_argument("source", help="scenario CSV or grouped_points.json")
+    parser.add_argument("output", nargs="?", default="grouped_points.bin")
+    parser.add_argument("--scenario", type=int, default=0,
+                        help="scenario number for a grouped_points.json source")
+    args = parser.parse_args()
+    reveal = load_reveal(args.source, args.scenario)
+    write_reveal(reveal, args.output)
+    print(f"Wrote {len(reveal['scenarios'])} scenarios, {len(reveal['locations'])} locations "
+          f"to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
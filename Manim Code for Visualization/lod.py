@@ -0,0 +1,112 @@
+"""
+Level-of-detail dots for dense maps.
+
+At national scale most of the 0.02-0.05 radius dots sit on top of each other.
+LODDots bins its points on a screen-space grid one dot diameter wide
+(lod_bins.py) and, while any bin holds more than `threshold` points, draws
+one dot per occupied bin with opacity and size growing with the count. The
+number of dots drawn is bounded by the number of occupied bins, not by the
+number of points.
+
+With auto_update, an updater re-picks the level whenever the group is scaled:
+once it has been zoomed in far enough that no bin is crowded, it switches to
+one dot per point. slide1 and slide2 never scale their per-year groups, so
+they build them with auto_update=False and skip the per-frame check.
+"""
+from manim import *
+import numpy as np
+from lod_bins import cell_size_for, pick_level
+
+
+class LODDots(VGroup):
+    """Dots that draw crowded areas as binned aggregates and re-level after zooms."""
+
+    def __init__(
+        self,
+        points,
+        cell_size=None,
+        threshold=4,
+        color="#E6E6FA",
+        radius=0.03,
+        opacity=0.3,
+        max_size_factor=2.5,
+        auto_update=True,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.cell_size = cell_size_for(radius) if cell_size is None else cell_size
+        self.threshold = threshold
+        self.dot_color = color
+        self.radius = radius
+        self.opacity = opacity
+        self.max_size_factor = max_size_factor
+
+        # Two invisible reference points ride along with every transform of
+        # the group, so the on-screen position of each raw point can be
+        # recovered without touching the dots themselves.
+        lo = points.min(axis=0) if len(points) else np.zeros(3)
+        hi = points.max(axis=0) if len(points) else np.zeros(3)
+        if np.allclose(lo[:2], hi[:2]):
+            hi = lo + np.array([1e-3, 0, 0])
+        self.ref = VMobject(stroke_width=0, fill_opacity=0).set_points_as_corners([lo, hi])
+        z0, z1 = complex(*lo[:2]), complex(*hi[:2])
+        self.local = (points[:, 0] + 1j * points[:, 1] - z0) / (z1 - z0)
+
+        self.level = None
+        self.last_scale = None
+        self.base_opacity = np.empty(0)
+        self.add(self.ref)
+        self.refresh(force=True)
+        if auto_update:
+            self.add_updater(lambda m: m.refresh())
+
+    def screen_points(self):
+        """Current scene positions of all raw points."""
+        start, end = self.ref.get_start(), self.ref.get_end()
+        z0, z1 = complex(*start[:2]), complex(*end[:2])
+        z = z0 + (z1 - z0) * self.local
+        return np.column_stack([z.real, z.imag, np.full(len(z), start[2])])
+
+    def _current_scale(self):
+        start, end = self.ref.get_start(), self.ref.get_end()
+        return np.linalg.norm(end - start)
+
+    def refresh(self, force=False):
+        """Re-pick the level of detail if the group was zoomed since the last check."""
+        scale = self._current_scale()
+        if not force and self.last_scale is not None and abs(scale / self.last_scale - 1) < 0.05:
+            return self
+        self.last_scale = scale
+        if len(self.local) == 0:
+            return self
+
+        points = self.screen_points()
+        level, centers, counts = pick_level(points, self.cell_size, self.threshold)
+        dense = level == "bins"
+        if not dense and self.level == "points" and not force:
+            return self
+
+        # Keep any fade applied to the group since the dots were built
+        dots = self.submobjects[1:]
+        factor = 1.0
+        if dots and len(self.base_opacity) and self.base_opacity[0] > 0:
+            factor = dots[0].get_fill_opacity() / self.base_opacity[0]
+
+        if dense:
+            self.level = "bins"
+            positions = np.column_stack([centers, np.full(len(centers), points[0, 2])])
+            sizes = self.radius * np.minimum(np.sqrt(counts), self.max_size_factor)
+            self.base_opacity = np.minimum(1.0, self.opacity * (1 + np.log(counts)))
+        else:
+            self.level = "points"
+            positions = points
+            sizes = np.full(len(points), self.radius)
+            self.base_opacity = np.full(len(points), self.opacity)
+
+        new_dots = [
+            Dot(pos, radius=r, color=self.dot_color).set_opacity(o * factor)
+            for pos, r, o in zip(positions, sizes, self.base_opacity)
+        ]
+        self.submobjects = [self.ref, *new_dots]
+        return self
@@ -0,0 +1,41 @@
+"""
+Screen-space binning behind lod.LODDots, in plain numpy so it can be used and
+tested without manim.
+
+A bin is one dot diameter wide: dots whose centers share a bin overlap on
+screen. A set of points is drawn as bins while any bin holds more than the
+threshold, and as individual points otherwise.
+"""
+import numpy as np
+
+
+def cell_size_for(radius):
+    """Bin size for dots of `radius`: one dot diameter."""
+    return 2 * radius
+
+
+def bin_points(points, cell_size):
+    """
+    Aggregate (N, 2+) positions into square bins of `cell_size`.
+    Returns (centers, counts, bin_of_point); centers are the mean position of
+    the points in each occupied bin.
+    """
+    xy = np.asarray(points, dtype=float)[:, :2]
+    cells = np.floor(xy / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0) if len(cells) else 0
+    # One integer key per cell keeps np.unique one-dimensional
+    keys = cells[:, 0] * (cells[:, 1].max(initial=0) + 1) + cells[:, 1]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    centers = np.column_stack([
+        np.bincount(inverse, weights=xy[:, 0]) / counts,
+        np.bincount(inverse, weights=xy[:, 1]) / counts,
+    ])
+    return centers, counts, inverse
+
+
+def pick_level(points, cell_size, threshold):
+    """("bins" or "points", centers, counts) for points at their current on-screen positions."""
+    centers, counts, _ = bin_points(points, cell_size)
+    level = "bins" if len(counts) and counts.max() > threshold else "points"
+    return level, centers, counts
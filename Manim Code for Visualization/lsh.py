@@ -0,0 +1,198 @@
+"""
+Locality-sensitive hashing over scenarios.
+
+Two indexes over the scenario matrix (scenario_matrix.py):
+- `MinHashIndex` hashes the existence bitset of every scenario (which
+  projects happen) and finds scenarios with high Jaccard similarity.
+- `ProjectionIndex` hashes the imputed month vectors with p-stable random
+  projections and finds scenarios close in Euclidean distance.
+
+Both put every scenario into one bucket per hash table. A query only looks at
+the scenarios sharing a bucket with it and ranks those exactly, so its cost
+depends on the bucket sizes, not on the number of scenarios. The candidates
+also drive `find_duplicates` and `approximate_medoid`.
+"""
+import numpy as np
+
+# Modulus of the universal hash family used by MinHash
+PRIME = (1 << 31) - 1
+# Rows hashed per block, so (block x projects) temporaries stay small
+BLOCK = 4096
+
+
+class _Tables:
+    """Rows grouped by their key in each of several hash tables."""
+
+    def __init__(self, keys):
+        # keys: (N, n_tables) uint64, one combined hash per row and table
+        self.keys = keys
+        self.sorted_keys = []
+        self.order = []
+        for t in range(keys.shape[1]):
+            order = np.argsort(keys[:, t], kind="stable")
+            self.order.append(order)
+            self.sorted_keys.append(keys[order, t])
+
+    def candidates(self, keys, exclude=None):
+        """Rows sharing at least one bucket with a row hashed to `keys`."""
+        found = []
+        for t, key in enumerate(keys):
+            lo = np.searchsorted(self.sorted_keys[t], key, "left")
+            hi = np.searchsorted(self.sorted_keys[t], key, "right")
+            found.append(self.order[t][lo:hi])
+        rows = np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+        return rows[rows != exclude] if exclude is not None else rows
+
+    def collisions(self):
+        """For every row, how many (table, other row) bucket collisions it has."""
+        counts = np.zeros(len(self.keys), dtype=np.int64)
+        for t in range(self.keys.shape[1]):
+            _, inverse, sizes = np.unique(self.keys[:, t], return_inverse=True, return_counts=True)
+            counts += sizes[inverse.ravel()] - 1
+        return counts
+
+
+def _combine(values, seed):
+    """Fold (N, n_tables, r) integer hashes into (N, n_tables) uint64 bucket keys."""
+    rng = np.random.default_rng(seed)
+    mult = rng.integers(1, 1 << 62, size=values.shape[-1], dtype=np.uint64) | np.uint64(1)
+    with np.errstate(over="ignore"):
+        return (values.astype(np.uint64) * mult).sum(axis=-1, dtype=np.uint64)
+
+
+class MinHashIndex:
+    """Jaccard-similarity index over existence bitsets (S, P) bool."""
+
+    def __init__(self, exists, n_hashes=128, bands=32, seed=0):
+        if n_hashes % bands:
+            raise ValueError("n_hashes must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, PRIME, n_hashes, dtype=np.int64)
+        self.b = rng.integers(0, PRIME, n_hashes, dtype=np.int64)
+        self.bands = bands
+        self.seed = seed
+        self.signatures = self.signature(exists)
+        self.tables = _Tables(self._band_keys(self.signatures))
+
+    def signature(self, exists):
+        """(N, n_hashes) MinHash signatures; an empty row gets PRIME everywhere."""
+        exists = np.asarray(exists, dtype=bool)
+        cols = np.arange(exists.shape[1], dtype=np.int64)
+        sig = np.empty((len(exists), len(self.a)), dtype=np.int64)
+        any_row = exists.any(axis=1)
+        for k, (a, b) in enumerate(zip(self.a, self.b)):
+            # Visit columns in hash order; the first existing one holds the minimum
+            h = (a * cols + b) % PRIME
+            perm = np.argsort(h)
+            for start in range(0, len(exists), BLOCK):
+                first = exists[start:start + BLOCK, perm].argmax(axis=1)
+                sig[start:start + BLOCK, k] = h[perm][first]
+        sig[~any_row] = PRIME
+        return sig
+
+    def _band_keys(self, signatures):
+        rows = signatures.shape[1] // self.bands
+        return _combine(signatures.reshape(len(signatures), self.bands, rows), self.seed)
+
+    def similarity(self, i, rows):
+        """Estimated Jaccard similarity between scenario i and `rows`."""
+        return (self.signatures[rows] == self.signatures[i]).mean(axis=1)
+
+    def nearest(self, i, n=10):
+        """Up to n scenarios most similar to scenario i, with their estimated Jaccard."""
+        rows = self.tables.candidates(self.tables.keys[i], exclude=i)
+        sim = self.similarity(i, rows)
+        top = np.argsort(-sim, kind="stable")[:n]
+        return rows[top], sim[top]
+
+    def within(self, i, r):
+        """Scenarios whose estimated Jaccard distance to scenario i is at most r."""
+        rows = self.tables.candidates(self.tables.keys[i], exclude=i)
+        sim = self.similarity(i, rows)
+        keep = 1 - sim <= r
+        return rows[keep], 1 - sim[keep]
+
+
+class ProjectionIndex:
+    """
+    Euclidean index over month vectors (S, P) with p-stable projections:
+    h(x) = floor((a . x + b) / width), `n_projections` of them per table.
+    """
+
+    def __init__(self, X, n_tables=8, n_projections=4, width=None, seed=0):
+        self.X = np.asarray(X)
+        rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.directions = rng.standard_normal((self.X.shape[1], n_tables * n_projections))
+        if width is None:
+            # Scale buckets to the typical spread of the data along a direction
+            sample = self.X[rng.choice(len(self.X), min(len(self.X), 1000), replace=False)]
+            width = max(float(np.median((sample @ self.directions).std(axis=0))), 1e-9)
+        self.width = width
+        self.offsets = rng.uniform(0, width, n_tables * n_projections)
+        self.n_tables = n_tables
+        self.tables = _Tables(self.hash(self.X))
+
+    def hash(self, X):
+        """(N, n_tables) bucket keys for rows of X."""
+        X = np.asarray(X, dtype=float)
+        keys = np.empty((len(X), self.n_tables), dtype=np.uint64)
+        for start in range(0, len(X), BLOCK):
+            proj = X[start:start + BLOCK] @ self.directions
+            cells = np.floor((proj + self.offsets) / self.width).astype(np.int64)
+            keys[start:start + BLOCK] = _combine(cells.reshape(len(cells), self.n_tables, -1), self.seed)
+        return keys
+
+    def _distances(self, x, rows):
+        diff = self.X[rows].astype(float) - x
+        return np.sqrt((diff * diff).sum(axis=1))
+
+    def nearest(self, i, n=10):
+        """Up to n candidates closest to scenario i, with exact distances."""
+        rows = self.tables.candidates(self.tables.keys[i], exclude=i)
+        d = self._distances(self.X[i].astype(float), rows)
+        top = np.argsort(d, kind="stable")[:n]
+        return rows[top], d[top]
+
+    def within(self, i, r):
+        """Candidates within Euclidean distance r of scenario i."""
+        rows = self.tables.candidates(self.tables.keys[i], exclude=i)
+        d = self._distances(self.X[i].astype(float), rows)
+        keep = d <= r
+        return rows[keep], d[keep]
+
+    def query(self, x, n=10):
+        """Nearest indexed scenarios to a new month vector x."""
+        x = np.asarray(x, dtype=float)
+        rows = self.tables.candidates(self.hash(x[None])[0])
+        d = self._distances(x, rows)
+        top = np.argsort(d, kind="stable")[:n]
+        return rows[top], d[top]
+
+
+def find_duplicates(index, tol=0.0):
+    """
+    Pairs (i, j), i < j, of indexed scenarios within `tol` of each other
+    (Euclidean for a ProjectionIndex, Jaccard distance for a MinHashIndex).
+    Only rows that share a bucket are compared.
+    """
+    pairs = []
+    for i in np.flatnonzero(index.tables.collisions() > 0):
+        rows, _ = index.within(i, tol)
+        pairs.extend((i, j) for j in rows if j > i)
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def approximate_medoid(index, members, weights=None, n_candidates=32):
+    """
+    Medoid of the scenarios `members` of a ProjectionIndex, computed exactly
+    over only the `n_candidates` members with the most bucket collisions
+    (the densest part of the cluster) instead of over every member.
+    """
+    members = np.asarray(members)
+    w = np.ones(len(members)) if weights is None else np.asarray(weights, dtype=float)
+    density = index.tables.collisions()[members]
+    candidates = members[np.argsort(-density, kind="stable")[:n_candidates]]
+    X = index.X[members].astype(float)
+    cost = [w @ np.sqrt(((X - index.X[c].astype(float)) ** 2).sum(axis=1)) for c in candidates]
+    return candidates[int(np.argmin(cost))]
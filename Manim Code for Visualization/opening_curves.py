@@ -0,0 +1,56 @@
+"""
+Time-aware scenario features: cumulative openings per state and month.
+
+Comparing month codes cell by cell treats an opening in 03.27 and one in
+04.27 as far apart as any two different values. Here every scenario becomes,
+for each state, the running count of projects (or rooms) opened by each
+month of the horizon. The Euclidean distance between two such curve vectors
+grows with how many openings move and by how many months, so a one-month
+slip barely counts. K-means and K-medoids use it through
+clustering.scenario_features(matrix, "curves").
+"""
+import numpy as np
+
+CACHE_KEY = "curves"
+
+
+def opening_curves(matrix, weight=None, months=None):
+    """
+    (S, n_states, n_months) cumulative openings of every scenario, plus the
+    state names and month codes of the axes. `weight` ("rooms" or None)
+    counts rooms instead of projects. Built with one bincount over all
+    scenarios and a prefix sum along the months.
+    """
+    months = matrix["months"] if months is None else months
+    states, state_idx = np.unique(matrix["states"], return_inverse=True)
+    opened = months > 0
+    if not opened.any():
+        return np.zeros((len(months), len(states), 0)), states, np.empty(0, dtype=np.int32)
+    first, last = months[opened].min(), months[opened].max()
+    n_months = int(last - first + 1)
+
+    rows, cols = np.nonzero(opened)
+    slot = (rows * len(states) + state_idx.ravel()[cols]) * n_months + (months[rows, cols] - first)
+    w = None if weight is None else np.asarray(matrix[weight], dtype=float)[cols]
+    counts = np.bincount(slot, weights=w, minlength=len(months) * len(states) * n_months)
+    curves = counts.reshape(len(months), len(states), n_months).cumsum(axis=2)
+    return curves, states, np.arange(first, last + 1, dtype=np.int32)
+
+
+def curve_features(matrix, weight=None):
+    """
+    Flattened curves as float32 rows, cached in the matrix dict so repeated
+    clustering runs on the same matrix build them once.
+    """
+    key = (CACHE_KEY, weight)
+    if key not in matrix:
+        curves, _, _ = opening_curves(matrix, weight)
+        matrix[key] = np.ascontiguousarray(curves.reshape(len(curves), -1), dtype=np.float32)
+    return matrix[key]
+
+
+def curve_distance(matrix, i, j, weight=None):
+    """Distance between scenarios i and j (matrix rows) under the curve metric."""
+    X = curve_features(matrix, weight)
+    diff = X[i].astype(float) - X[j]
+    return float(np.sqrt(diff @ diff))
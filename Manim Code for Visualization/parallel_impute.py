@@ -0,0 +1,66 @@
+"""
+slide7's imputation spread over processes.
+
+Imputation only looks inside one scenario row, so row blocks are independent.
+`parallel_impute` puts the month matrix and the output in
+multiprocessing.shared_memory and hands each worker a (start, stop) row range;
+no matrix data is pickled. Every block runs `scenario_matrix.impute_rows`, so
+the result is identical to `impute` on one core.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from scenario_matrix import impute_rows, state_segments
+
+# Rows per task; small enough to balance, large enough to amortize dispatch
+BLOCK_ROWS = 2048
+
+_worker = {}
+
+
+def _init_worker(src_name, dst_name, shape, dtype, lon, segments):
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    _worker.update(
+        src=src,
+        dst=dst,
+        months=np.ndarray(shape, dtype=dtype, buffer=src.buf),
+        out=np.ndarray(shape, dtype=dtype, buffer=dst.buf),
+        lon=lon,
+        segments=segments,
+    )
+
+
+def _impute_block(start, stop):
+    w = _worker
+    w["out"][start:stop] = impute_rows(w["months"][start:stop], w["lon"], w["segments"])
+    return stop - start
+
+
+def parallel_impute(matrix, workers=None, block_rows=BLOCK_ROWS):
+    """Imputed month codes for a `build_scenario_matrix` dict, computed in parallel."""
+    months = np.ascontiguousarray(matrix["months"])
+    lon = np.asarray(matrix["lon"], dtype=float)
+    segments = state_segments(matrix["states"])
+    if months.size == 0:
+        return months.copy()
+
+    src = shared_memory.SharedMemory(create=True, size=months.nbytes)
+    dst = shared_memory.SharedMemory(create=True, size=months.nbytes)
+    try:
+        np.ndarray(months.shape, dtype=months.dtype, buffer=src.buf)[:] = months
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(src.name, dst.name, months.shape, months.dtype, lon, segments),
+        ) as pool:
+            starts = range(0, len(months), block_rows)
+            list(pool.map(_impute_block, starts, [min(s + block_rows, len(months)) for s in starts]))
+        return np.ndarray(months.shape, dtype=months.dtype, buffer=dst.buf).copy()
+    finally:
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,45 @@
+from manim import *
+import numpy as np
+from projection import project_df
+
+
+class PointSet(VGroup):
+    """
+    One Dot per row of a DataFrame, built once. Subsets (a state, a metro
+    area, everything else) are views selected with boolean masks: VGroups
+    holding the same Dot objects, so animating a view animates the master set
+    and nothing is constructed twice.
+    """
+
+    def __init__(self, df, frame="national", color="#E6E6FA", radius=0.03, opacity=0.3, key=None, **kwargs):
+        positions = project_df(df, frame, key)
+        super().__init__(
+            *[Dot(pos, color=color, radius=radius).set_opacity(opacity) for pos in positions],
+            **kwargs,
+        )
+
+    def view(self, mask):
+        """The dots whose rows are True in `mask`, in row order."""
+        mask = np.asarray(mask, dtype=bool)
+        return VGroup(*[self.submobjects[i] for i in np.flatnonzero(mask)])
+
+
+def resize_dots(group, factor):
+    """Resize every dot of `group` about its own center, leaving positions alone."""
+    for dot in group:
+        dot.scale(factor)
+    return group
+
+
+def move_dots(group, positions, center=None):
+    """
+    Move every dot of `group` to its row of `positions`, keeping its size.
+    With `center`, the positions are first shifted so that their bounding
+    box is centered there.
+    """
+    positions = np.asarray(positions, dtype=float)
+    if center is not None:
+        positions = positions + (np.asarray(center) - (positions.min(0) + positions.max(0)) / 2)
+    for dot, pos in zip(group, positions):
+        dot.move_to(pos)
+    return group
@@ -0,0 +1,77 @@
+"""
+Prepare the next phase of a scene while the current one renders.
+
+Inside `Scene.play` the main thread spends most of its time rasterizing
+frames and writing them to ffmpeg. The next phase's data (sorted frames,
+index arrays) does not touch the scene, so it can be prepared on a
+background thread meanwhile; numpy, pandas and file reads release the GIL
+often enough for the two to overlap.
+
+Only pure data may be built in the background. Mobjects, Tex above all,
+share manim's config and Tex file cache, which are not thread-safe, so the
+caller turns the prepared data into mobjects on the main thread.
+
+There is a single worker thread, so jobs run one at a time in submission
+order and results come back in the order they were asked for; scene-level
+random draws made in jobs keep their sequence.
+
+Usage:
+    prefetch = Prefetcher()
+    frames = prefetch.submit(prepare_frames, df)    # starts now
+    ...                                             # self.play(...) meanwhile
+    for year, indices in prefetch.iterate(years, year_indices):
+        self.play(...)
+    prefetch.close()
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class Prefetcher:
+    """
+    Background builder for scene phases. With enabled=False every job runs
+    immediately on the calling thread, which gives the original sequential
+    behavior for comparison.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") if enabled else None
+
+    def submit(self, fn, *args, **kwargs):
+        """Start `fn(*args, **kwargs)` in the background; returns a Future."""
+        if self.pool is not None:
+            return self.pool.submit(fn, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def iterate(self, items, build, lookahead=1):
+        """
+        Iterator of (item, build(item)) for every item, building the next
+        `lookahead` items while the caller is busy with the current one. The
+        first builds start right away, so the iterator can be created a few
+        plays before the loop that consumes it.
+        """
+        items = list(items)
+        pending = [self.submit(build, item) for item in items[:lookahead]]
+
+        def results():
+            for i, item in enumerate(items):
+                if i + lookahead < len(items):
+                    pending.append(self.submit(build, items[i + lookahead]))
+                yield item, pending.pop(0).result()
+
+        return results()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
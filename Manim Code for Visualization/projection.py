@@ -0,0 +1,71 @@
+"""
+Shared Lat/Lon -> scene coordinate projection for all slides.
+
+Every slide used to carry its own `normalize_coordinates`, scaled either for
+the national map (`* 0.7 + 2`) or for the Atlanta close-ups (`* 17.5`). Both
+are named frames here, next to the Georgia zoom of slide3, and whole columns
+are projected in one call.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+# Continental US bounding box mapped onto a 10 x 6 box around the origin
+LON_RANGE = (-125, -66)
+LAT_RANGE = (25, 49)
+
+# scale/offset apply to the normalized box; with an anchor (lat, lon) the
+# anchor point lands on `offset` instead of the box center.
+FRAMES = {
+    "national": {"scale": 0.7, "offset": (2, 0), "anchor": None},
+    "state": {"scale": 3.5, "offset": (0, 0.2), "anchor": (32.9, -83.4)},  # Georgia
+    "metro": {"scale": 17.5, "offset": (0, 0), "anchor": None},  # Atlanta close-ups
+}
+
+# Projected datasets kept by project_df, least recently used evicted first
+CACHE_SIZE = 64
+_cache = OrderedDict()
+
+
+def _normalize(lat, lon):
+    x = (lon - LON_RANGE[0]) / (LON_RANGE[1] - LON_RANGE[0]) * 10 - 5
+    y = (lat - LAT_RANGE[0]) / (LAT_RANGE[1] - LAT_RANGE[0]) * 6 - 3
+    return x, y
+
+
+def project(lat, lon, frame="national"):
+    """Project Lat/Lon arrays into scene coordinates, returning an (N, 3) array."""
+    spec = FRAMES[frame]
+    lat = np.asarray(lat, dtype=float).ravel()
+    lon = np.asarray(lon, dtype=float).ravel()
+    x, y = _normalize(lat, lon)
+    if spec["anchor"] is not None:
+        ax, ay = _normalize(*spec["anchor"])
+        x, y = x - ax, y - ay
+    points = np.zeros((len(lat), 3))
+    points[:, 0] = x * spec["scale"] + spec["offset"][0]
+    points[:, 1] = y * spec["scale"] + spec["offset"][1]
+    return points
+
+
+def project_df(df, frame="national", key=None):
+    """
+    Projected Lat/Lon of every row of `df`. With a `key` naming the dataset
+    (e.g. ("Atlanta.csv", scenario)) the result is cached per key and frame,
+    keeping the CACHE_SIZE most recently used; without one it is simply
+    projected, since hashing the coordinates costs as much as projecting them.
+    """
+    lat = df["Lat"].to_numpy(dtype=float)
+    lon = df["Lon"].to_numpy(dtype=float)
+    if key is None:
+        return project(lat, lon, frame)
+    cache_key = (key, frame)
+    if cache_key in _cache:
+        _cache.move_to_end(cache_key)
+        return _cache[cache_key]
+    points = project(lat, lon, frame)
+    points.setflags(write=False)
+    _cache[cache_key] = points
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return points
@@ -0,0 +1,175 @@
+"""
+Local HTTP/JSON service over a reduced-set file (reduced_export.py).
+
+Answers planner questions straight from the memory-mapped arrays, with
+results kept in an LRU cache:
+
+    GET /clusters                      K, cost, probability of every cluster
+    GET /cluster?scenario=412          cluster and representative of a scenario
+    GET /probability?cluster=3         probability mass of a cluster
+    GET /medoid?state=GA[&cluster=3]   representative scenario(s) with their
+                                       projects in that state and opening months
+
+Built on asyncio streams only; it binds to localhost by default.
+
+Usage:
+    python query_service.py reduced.bin --port 8765
+    curl 'http://127.0.0.1:8765/cluster?scenario=412'
+"""
+import argparse
+import asyncio
+import json
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from reduced_export import read_reduced
+from scenario_matrix import month_label
+
+
+class QueryError(ValueError):
+    """A request the artifacts cannot answer; reported as HTTP 400/404."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class ReducedSet:
+    """Query functions over one reduced-set file."""
+
+    def __init__(self, path, cache_size=4096):
+        self.arrays = read_reduced(path)
+        self.k = len(self.arrays["scenario"])
+        self.query = lru_cache(maxsize=cache_size)(self._query)
+
+    def clusters(self):
+        a = self.arrays
+        return {
+            "k": self.k,
+            "cost": float(a["cost"]),
+            "clusters": [
+                {"cluster": c, "representative": int(a["scenario"][c]),
+                 "probability": float(a["probability"][c])}
+                for c in range(self.k)
+            ],
+        }
+
+    def cluster_of(self, scenario):
+        a = self.arrays
+        i = int(np.searchsorted(a["member_scenario"], scenario))
+        if i >= len(a["member_scenario"]) or a["member_scenario"][i] != scenario:
+            raise QueryError(f"unknown scenario {scenario}", 404)
+        c = int(a["member_cluster"][i])
+        return {"scenario": scenario, "cluster": c, "representative": int(a["scenario"][c]),
+                "probability": float(a["probability"][c])}
+
+    def probability(self, cluster):
+        self._check_cluster(cluster)
+        return {"cluster": cluster, "probability": float(self.arrays["probability"][cluster])}
+
+    def medoid(self, state, cluster=None):
+        a = self.arrays
+        cols = np.flatnonzero(a["state"] == state)
+        if len(cols) == 0:
+            raise QueryError(f"no projects in state {state!r}", 404)
+        if cluster is not None:
+            self._check_cluster(cluster)
+        result = []
+        for c in range(self.k) if cluster is None else [cluster]:
+            months = a["months"][c, cols]
+            happens = months > 0
+            result.append({
+                "cluster": c,
+                "representative": int(a["scenario"][c]),
+                "probability": float(a["probability"][c]),
+                "projects": [
+                    {"store": int(a["store_no"][col]), "open": month_label(m)}
+                    for col, m in zip(cols[happens], months[happens])
+                ],
+            })
+        return {"state": state, "medoids": result}
+
+    def _check_cluster(self, cluster):
+        if not 0 <= cluster < self.k:
+            raise QueryError(f"cluster must be in 0..{self.k - 1}", 404)
+
+    def _query(self, route, params):
+        """Dispatch one request; `params` is a sorted tuple of (name, value) pairs so it can be cached."""
+        params = dict(params)
+        try:
+            if route == "/clusters":
+                return self.clusters()
+            if route == "/cluster":
+                return self.cluster_of(int(params["scenario"]))
+            if route == "/probability":
+                return self.probability(int(params["cluster"]))
+            if route == "/medoid":
+                cluster = params.get("cluster")
+                return self.medoid(params["state"], None if cluster is None else int(cluster))
+        except KeyError as missing:
+            raise QueryError(f"missing parameter {missing}")
+        except ValueError as bad:
+            if isinstance(bad, QueryError):
+                raise
+            raise QueryError(str(bad))
+        raise QueryError(f"unknown route {route}", 404)
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+async def _handle(reduced, reader, writer):
+    try:
+        request = await reader.readline()
+        # Skip the headers; every route is a GET without a body
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request.decode("latin-1").split()
+        if len(parts) < 2 or parts[0] != "GET":
+            status, body = 405, {"error": "only GET is supported"}
+        else:
+            url = urlsplit(parts[1])
+            try:
+                status, body = 200, reduced.query(url.path, tuple(sorted(parse_qsl(url.query))))
+            except QueryError as error:
+                status, body = error.status, {"error": str(error)}
+            except Exception as error:
+                status, body = 500, {"error": repr(error)}
+        payload = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def start_server(path, host="127.0.0.1", port=8765):
+    """Start serving `path`; returns the asyncio server (port=0 picks a free port)."""
+    reduced = ReducedSet(path)
+    return await asyncio.start_server(lambda r, w: _handle(reduced, r, w), host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve cluster queries over a reduced-set file.")
+    parser.add_argument("path", nargs="?", default="reduced.bin")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    async def run():
+        server = await start_server(args.path, args.host, args.port)
+        print(f"Serving {args.path} on http://{args.host}:{server.sockets[0].getsockname()[1]}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Export of the reduced scenario set for the stochastic optimization model.
+
+One binary file in grouped_points.py's layout (JSON header, 64-byte aligned
+raw arrays), one array per column:
+
+    scenario       (K,)    representative scenario numbers
+    probability    (K,)    probability of each representative
+    months         (K, P)  opening month codes of each representative
+                           (scenario_matrix.month_code, 0 = does not happen)
+    member_scenario (S,)   every original scenario ...
+    member_cluster  (S,)   ... and the representative it was merged into
+    store_no, lat, lon, state, rooms, banner  (P,)  project attributes
+    cost           ()      clustering cost
+
+`read_reduced` memory-maps only the columns asked for, so a model build that
+needs `probability` and `months` never touches the membership arrays.
+
+Usage:
+    python reduced_export.py output_with_metropolitan.csv reduced.bin --k 10
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from clustering import FEATURES, reduce_scenarios, scenario_features
+from grouped_points import read_arrays, write_arrays
+from scenario_matrix import build_scenario_matrix, project_columns
+
+MAGIC = b"GRED0001"
+
+# Output column -> CSV column of the project attributes
+PROJECT_COLUMNS = {
+    "store_no": "Store No.",
+    "lat": "Lat",
+    "lon": "Lon",
+    "state": "State/Province",
+    "rooms": "Project Rooms",
+    "banner": "Banner",
+}
+# Fill values of the attribute columns a CSV may lack, as in build_scenario_matrix
+OPTIONAL_COLUMNS = {"Project Rooms": 0, "Banner": ""}
+
+
+def reduced_arrays(df, matrix, result):
+    """
+    Columns of the export from a scenario frame, its matrix and a
+    `reduce_scenarios` result. Clusters that ended up empty (representative
+    -1, probability 0) are left out and the remaining ones renumbered.
+    """
+    reps = np.asarray(result["representatives"])
+    probabilities = np.asarray(result["probabilities"], dtype=np.float64)
+    kept = np.flatnonzero((reps >= 0) & (probabilities > 0))
+    renumber = np.full(len(reps), -1, dtype=np.int32)
+    renumber[kept] = np.arange(len(kept))
+    projects = project_columns(df)
+    arrays = {
+        "scenario": matrix["scenarios"][reps[kept]],
+        "probability": probabilities[kept],
+        "months": matrix["months"][reps[kept]],
+        "member_scenario": matrix["scenarios"],
+        "member_cluster": renumber[np.asarray(result["labels"])],
+    }
+    for name, column in PROJECT_COLUMNS.items():
+        if column in projects:
+            values = projects[column].to_numpy()
+        else:
+            values = np.full(len(projects), OPTIONAL_COLUMNS[column])
+        # Text columns become fixed-width strings, which memory-map like numbers
+        arrays[name] = values.astype(str) if values.dtype == object else values
+    arrays["cost"] = np.array(result["cost"], dtype=np.float64)
+    return arrays
+
+
+def write_reduced(arrays, file_path):
+    write_arrays(arrays, file_path, MAGIC)
+
+
+def read_reduced(file_path, columns=None):
+    """Memory-map the requested columns (all by default) of a reduced-set file."""
+    return read_arrays(file_path, columns, MAGIC)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reduce a scenario CSV and export the result.")
+    parser.add_argument("csv")
+    parser.add_argument("output", nargs="?", default="reduced.bin")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--method", choices=["kmeans", "kmedoids"], default="kmeans")
+    parser.add_argument("--metric", choices=sorted(FEATURES), default="months")
+    parser.add_argument("--components", type=int, help="cluster in this many PCA dimensions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    matrix = build_scenario_matrix(df)
+    result = reduce_scenarios(scenario_features(matrix, args.metric), args.k, args.method, args.seed,
+                              n_components=args.components)
+    arrays = reduced_arrays(df, matrix, result)
+    write_reduced(arrays, args.output)
+    print(f"Wrote {len(arrays['scenario'])} representative scenarios to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Render every slide scene in parallel.
+
+Scenes are discovered from slide1.py-slide7.py without importing them, then
+rendered in a bounded process pool. Long scenes can be split into sections
+(ranges of animation numbers, the same ranges `manim -n start,end` uses) that
+render concurrently and are stitched back together with ffmpeg.
+
+Usage:
+    python render_all.py --workers 4 --sections 3 --quality low_quality
+"""
+import argparse
+import ast
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+SLIDES_DIR = Path(__file__).resolve().parent
+SLIDE_FILES = [SLIDES_DIR / f"slide{i}.py" for i in range(1, 8)]
+SCENE_BASES = {"Scene", "ThreeDScene", "MovingCameraScene", "ZoomedScene"}
+
+# Every process replays construct() from the start, so the random choices in
+# slide5/slide7 must be seeded identically for the sections to line up.
+SEED = 0
+
+
+def discover_scenes(files=SLIDE_FILES):
+    """
+    Return (file, scene_name) pairs for every scene class in `files`.
+    A name defined twice in one file (slide6's ReferenceMatrix) is only
+    listed once, since the last definition is the one Python keeps.
+    """
+    scenes = []
+    for path in files:
+        tree = ast.parse(Path(path).read_text(), filename=str(path))
+        names = []
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = {b.id for b in node.bases if isinstance(b, ast.Name)}
+            if bases & SCENE_BASES:
+                if node.name in names:
+                    names.remove(node.name)
+                names.append(node.name)
+        scenes.extend((Path(path), name) for name in names)
+    return scenes
+
+
+def load_scene_class(path, scene_name):
+    """Import a slide file under a unique module name and return the scene class."""
+    path = Path(path)
+    module_name = f"_slides_{path.stem}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        sys.path.insert(0, str(path.parent))
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+def _init_worker(data_dir):
+    # The slides open their CSV/JSON inputs with relative paths
+    os.chdir(data_dir)
+
+
+def count_animations(path, scene_name, quality="low_quality"):
+    """Run the scene with manim's dry_run to find how many play/wait calls it makes."""
+    from manim import tempconfig
+
+    random.seed(SEED)
+    np.random.seed(SEED)
+    scene_cls = load_scene_class(path, scene_name)
+    with tempconfig({"quality": quality, "dry_run": True, "progress_bar": "none"}):
+        scene = scene_cls()
+        scene.render()
+        return scene.renderer.num_plays
+
+
+def render_scene(path, scene_name, quality="low_quality", media_dir="media",
+                 section=None, output_file=None):
+    """
+    Render one scene (or one section of it) and return the movie path.
+    `section` is a (start, end) pair of animation numbers, end exclusive.
+    """
+    from manim import tempconfig
+
+    random.seed(SEED)
+    np.random.seed(SEED)
+    scene_cls = load_scene_class(path, scene_name)
+    options = {
+        "quality": quality,
+        "media_dir": str(Path(media_dir).resolve()),
+        "progress_bar": "none",
+        "output_file": output_file or f"{Path(path).stem}_{scene_name}",
+    }
+    if section is not None:
+        options.update(section_options(section))
+        # Partial movies live in a directory keyed by the scene class, so
+        # concurrent sections of one scene each get their own media_dir
+        options["media_dir"] = str(Path(media_dir).resolve() / "sections" / options["output_file"])
+        options["disable_caching"] = True
+    start = time.perf_counter()
+    with tempconfig(options):
+        scene = scene_cls()
+        scene.render()
+        movie = scene.renderer.file_writer.movie_file_path
+    return str(movie), time.perf_counter() - start
+
+
+def section_options(section):
+    """
+    manim options rendering the animations section[0] .. section[1] - 1;
+    upto_animation_number is inclusive.
+    """
+    return {"from_animation_number": section[0], "upto_animation_number": section[1] - 1}
+
+
+def split_sections(num_animations, sections):
+    """
+    Split [0, num_animations) into at most `sections` contiguous ranges;
+    none for a scene without animations.
+    """
+    sections = max(1, min(sections, num_animations))
+    bounds = np.linspace(0, num_animations, sections + 1).round().astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def scene_sections(num_animations, sections):
+    """
+    Sections to render a scene in; [None] renders it whole. Scenes that
+    would get fewer than two ranges, including ones without animations
+    (only waits and adds), are rendered whole.
+    """
+    ranges = split_sections(num_animations, sections) if sections > 1 else []
+    return ranges if len(ranges) > 1 else [None]
+
+
+def stitch(movies, output_path):
+    """Concatenate section movies (same codec/resolution) without re-encoding."""
+    output_path = Path(output_path)
+    list_file = output_path.with_suffix(".txt")
+    list_file.write_text("".join(f"file '{Path(m).resolve()}'\n" for m in movies))
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+         "-i", str(list_file), "-c", "copy", str(output_path)],
+        check=True,
+    )
+    list_file.unlink()
+    return str(output_path)
+
+
+def render_all(scenes=None, workers=None, sections=1, quality="low_quality",
+               media_dir="media", data_dir=SLIDES_DIR):
+    """
+    Render `scenes` (default: all discovered scenes) in a process pool of at
+    most `workers` processes and return {"slideN_Scene": movie_path}.
+    """
+    scenes = scenes if scenes is not None else discover_scenes()
+    media_dir = Path(media_dir).resolve()
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(data_dir),)) as pool:
+        # Find out how long each scene is before handing out sections
+        counts = {}
+        if sections > 1:
+            futures = {pool.submit(count_animations, p, n, quality): (p, n) for p, n in scenes}
+            for future in as_completed(futures):
+                counts[futures[future]] = future.result()
+
+        jobs = {}
+        for path, name in scenes:
+            key = f"{path.stem}_{name}"
+            ranges = scene_sections(counts.get((path, name), 0), sections)
+            for idx, section in enumerate(ranges):
+                output_file = key if section is None else f"{key}_part{idx:02d}"
+                future = pool.submit(render_scene, path, name, quality, media_dir,
+                                     section, output_file)
+                jobs[future] = (key, idx, len(ranges))
+
+        parts = {}
+        for future in as_completed(jobs):
+            key, idx, total = jobs[future]
+            movie, elapsed = future.result()
+            parts.setdefault(key, [None] * total)[idx] = movie
+            print(f"{key} [{idx + 1}/{total}] rendered in {elapsed:.1f}s")
+
+    for key, movies in parts.items():
+        if len(movies) == 1:
+            results[key] = movies[0]
+        else:
+            # Same place as an unsplit render: videos/<module>/<quality>/
+            output = media_dir.joinpath("videos", *Path(movies[0]).parts[-3:-1], f"{key}.mp4")
+            output.parent.mkdir(parents=True, exist_ok=True)
+            results[key] = stitch(movies, output)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all slide scenes in parallel.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--sections", type=int, default=1,
+                        help="split each scene into this many concurrently rendered sections")
+    parser.add_argument("--quality", default="low_quality")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--data-dir", default=str(SLIDES_DIR),
+                        help="directory holding the CSV/JSON inputs of the slides")
+    parser.add_argument("--only", nargs="*", help="render only these slideN_Scene keys")
+    args = parser.parse_args()
+
+    scenes = discover_scenes()
+    if args.only:
+        scenes = [(p, n) for p, n in scenes if f"{p.stem}_{n}" in args.only]
+
+    start = time.perf_counter()
+    results = render_all(scenes, args.workers, args.sections, args.quality,
+                         args.media_dir, args.data_dir)
+    for key, movie in sorted(results.items()):
+        print(f"{key}: {movie}")
+    print(f"Total wall time: {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+The scenario x project matrix behind slide7's reference grid, as arrays.
+
+Columns are projects in slide7's order (State/Province, then ascending Lat),
+rows are scenarios. Each cell holds the opening month as an integer code
+(0 where the project does not happen in that scenario, slide7's "0"), and
+`impute` fills zeros from the nearer-by-longitude neighbor inside the same
+state segment, the rule slide7 animates.
+"""
+import numpy as np
+import pandas as pd
+
+# Month codes count from January 2000 = 1 so that 0 stays free for "absent"
+EPOCH_YEAR = 2000
+
+
+def month_code(dates):
+    """Integer month codes for an array of dates (anything pd.to_datetime takes)."""
+    d = pd.DatetimeIndex(pd.to_datetime(dates))
+    return ((d.year - EPOCH_YEAR) * 12 + d.month).to_numpy(dtype=np.int32)
+
+
+def month_label(code):
+    """slide7's MM.YY text for a month code; "0" for an absent cell."""
+    code = int(code)
+    if code <= 0:
+        return "0"
+    year, month = divmod(code - 1, 12)
+    return f"{month + 1:02d}.{(EPOCH_YEAR + year) % 100:02d}"
+
+
+def project_columns(df):
+    """One row per project in column order: (State/Province, then Lat)."""
+    return (
+        df.drop_duplicates("Store No.")
+        .sort_values(["State/Province", "Lat"], kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def fill_months(df, stores):
+    """
+    (scenarios, months) for the rows of `df`, with months laid out in the
+    column order given by `stores`.
+    """
+    scenarios, row = np.unique(df["Scenario"].to_numpy(), return_inverse=True)
+    col = pd.Index(stores).get_indexer(df["Store No."])
+    months = np.zeros((len(scenarios), len(stores)), dtype=np.int32)
+    months[row.ravel(), col] = month_code(df["Ops Est Open"])
+    return scenarios, months
+
+
+def build_scenario_matrix(df):
+    """
+    Scenario x project arrays from an output_with_metropolitan.csv-style frame.
+
+    Returns a dict with
+        scenarios : sorted scenario numbers (row order)
+        stores    : Store No. per column, ordered by (State/Province, Lat)
+        states    : State/Province per column
+        lat, lon  : coordinates per column
+        rooms     : Project Rooms per column (0 when the column is missing)
+        metropolitan : Metropolitan flag per column (False when missing)
+        months    : (S, P) int32 month codes, 0 where the project is absent
+        exists    : (S, P) bool, months > 0
+    """
+    projects = project_columns(df)
+    scenarios, months = fill_months(df, projects["Store No."].to_numpy())
+    return {
+        "scenarios": scenarios,
+        "stores": projects["Store No."].to_numpy(),
+        "states": projects["State/Province"].astype(str).to_numpy(),
+        "lat": projects["Lat"].to_numpy(dtype=float),
+        "lon": projects["Lon"].to_numpy(dtype=float),
+        "rooms": projects.get("Project Rooms", pd.Series(0, index=projects.index)).to_numpy(),
+        "metropolitan": projects.get("Metropolitan", pd.Series(False, index=projects.index))
+        .astype(bool).to_numpy(),
+        "months": months,
+        "exists": months > 0,
+    }
+
+
+def state_segments(states):
+    """Segment number per column; a new segment starts at every state boundary."""
+    states = np.asarray(states)
+    return np.r_[0, np.cumsum(states[1:] != states[:-1])]
+
+
+def impute_rows(months, lon, segments):
+    """
+    slide7's imputation on a block of rows: every 0 takes the value of its
+    left or right neighbor in the same state segment, whichever is closer in
+    longitude (left on a tie). Neighbors that are 0 themselves do not count,
+    and zeros without a usable neighbor stay 0. One pass, as in the slide.
+    """
+    months = np.asarray(months)
+    out = months.copy()
+    if months.shape[1] < 2:
+        return out
+
+    same = segments[1:] == segments[:-1]
+    gap = np.abs(np.diff(lon))
+    zero = months == 0
+    # left[:, c] / right[:, c]: usable neighbor for column c (+1 / -1 shifted)
+    left = np.zeros_like(zero)
+    right = np.zeros_like(zero)
+    left[:, 1:] = same & (months[:, :-1] > 0)
+    right[:, :-1] = same & (months[:, 1:] > 0)
+    dl = np.r_[np.inf, gap]
+    dr = np.r_[gap, np.inf]
+
+    take_left = zero & left & (~right | (dl <= dr))
+    take_right = zero & right & ~take_left
+    out[:, 1:][take_left[:, 1:]] = months[:, :-1][take_left[:, 1:]]
+    out[:, :-1][take_right[:, :-1]] = months[:, 1:][take_right[:, :-1]]
+    return out
+
+
+def impute(matrix):
+    """Imputed month codes for a matrix from `build_scenario_matrix`."""
+    return impute_rows(matrix["months"], matrix["lon"], state_segments(matrix["states"]))
@@ -0,0 +1,131 @@
+"""
+Multi-stage scenario tree over the 2025-2030 opening horizon.
+
+Stage t sees only what has opened by the end of year t, the same yearly
+reveal slide1 and slide4 animate. The root holds every scenario. Each node of
+stage t - 1 splits its scenarios into up to `branching[t]` children by
+K-means on their opening curves (opening_curves.py) up to year t. A child's
+probability is its share of scenarios, and its representative is its medoid.
+
+The curves are cumulative over months, so one array built once serves every
+stage: stage t uses its prefix up to the last month of year t. Nodes of one
+stage are independent and are clustered in a process pool.
+
+Usage:
+    python scenario_tree.py output_with_metropolitan.csv --branching 3 2 2
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from clustering import kmeans, medoids_of
+from opening_curves import opening_curves
+from scenario_matrix import EPOCH_YEAR, build_scenario_matrix
+
+_worker = {}
+
+
+def _init_worker(curves):
+    _worker["curves"] = curves
+
+
+def _split(rows, n_months, k, seed):
+    """Cluster `rows` on their curves up to month index n_months; (labels, medoid rows)."""
+    X = _worker["curves"][rows, :, :n_months].reshape(len(rows), -1).astype(float)
+    k = min(k, len(np.unique(X, axis=0)))
+    if k <= 1:
+        return np.zeros(len(rows), dtype=np.int64), rows[medoids_of(X, np.zeros(len(rows), int), 1)]
+    labels, _, _ = kmeans(X, k, seed=seed)
+    # Renumber so clusters that ended up empty leave no gap
+    _, labels = np.unique(labels, return_inverse=True)
+    labels = labels.ravel()
+    return labels, rows[medoids_of(X, labels, labels.max() + 1)]
+
+
+def stage_ends(month_codes, years):
+    """Number of leading curve months that fall in or before each year."""
+    month_codes = np.asarray(month_codes)
+    return [int(np.searchsorted(month_codes, (year - EPOCH_YEAR + 1) * 12, side="right"))
+            for year in years]
+
+
+def build_tree(matrix, branching, years=None, weight=None, seed=0, workers=None):
+    """
+    Scenario tree of a scenario matrix. `branching` gives the children per
+    node at each stage; `years` the last year revealed at each stage
+    (default: the first len(branching) years with openings).
+
+    Returns a dict of per-node arrays (node 0 is the root)
+        parent, stage, probability, representative (matrix row)
+    plus `leaf` (the leaf node of every scenario) and `years`.
+    """
+    curves, _, month_codes = opening_curves(matrix, weight)
+    if years is None:
+        first = (month_codes[0] - 1) // 12 + EPOCH_YEAR if len(month_codes) else EPOCH_YEAR
+        years = [first + t for t in range(len(branching))]
+    ends = stage_ends(month_codes, years)
+
+    n = len(curves)
+    parent, stage, probability, representative = [-1], [0], [1.0], [-1]
+    members = {0: np.arange(n)}
+    frontier = [0]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(curves,)) as pool:
+        for t, (k, end) in enumerate(zip(branching, ends), start=1):
+            futures = [pool.submit(_split, members[node], end, k, seed) for node in frontier]
+            next_frontier = []
+            for node, future in zip(frontier, futures):
+                labels, medoids = future.result()
+                rows = members.pop(node)
+                for c, medoid in enumerate(medoids):
+                    child = len(parent)
+                    parent.append(node)
+                    stage.append(t)
+                    probability.append(np.sum(labels == c) / n)
+                    representative.append(int(medoid))
+                    members[child] = rows[labels == c]
+                    next_frontier.append(child)
+            frontier = next_frontier
+
+    leaf = np.empty(n, dtype=np.int64)
+    for node, rows in members.items():
+        leaf[rows] = node
+    return {
+        "parent": np.array(parent),
+        "stage": np.array(stage),
+        "probability": np.array(probability),
+        "representative": np.array(representative),
+        "leaf": leaf,
+        "years": np.array(years),
+    }
+
+
+def print_tree(tree, scenarios, node=0, indent=""):
+    year = "root" if node == 0 else f"{tree['years'][tree['stage'][node] - 1]}"
+    rep = tree["representative"][node]
+    label = "" if rep < 0 else f", scenario {scenarios[rep]}"
+    print(f"{indent}{year}: p={tree['probability'][node]:.3f}{label}")
+    for child in np.flatnonzero(tree["parent"] == node):
+        print_tree(tree, scenarios, child, indent + "    ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a multi-stage scenario tree.")
+    parser.add_argument("csv")
+    parser.add_argument("--branching", type=int, nargs="+", default=[2, 2, 2])
+    parser.add_argument("--years", type=int, nargs="*")
+    parser.add_argument("--rooms", action="store_true", help="weight openings by rooms")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    matrix = build_scenario_matrix(pd.read_csv(args.csv))
+    tree = build_tree(matrix, args.branching, args.years, "rooms" if args.rooms else None,
+                      workers=args.workers)
+    print_tree(tree, matrix["scenarios"])
+
+
+if __name__ == "__main__":
+    main()
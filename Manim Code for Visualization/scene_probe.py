@@ -0,0 +1,52 @@
+"""
+Scene instrumentation shared by dry_run.py and benchmark.py.
+
+`DryRunMixin` counts the play/wait calls of a scene and the mobjects on
+screen; `PlaceholderTex` stands in for Tex/Text so a dry run compiles no
+LaTeX. Kept apart from dry_run's PhaseTimer so that importing these runs on
+any Python version manim supports.
+"""
+from manim import DEFAULT_FONT_SIZE, WHITE, Rectangle
+
+TEXT_CLASSES = ("Tex", "MathTex", "Text", "MarkupText")
+
+
+class PlaceholderTex(Rectangle):
+    """Invisible box roughly the size the text would have, built without LaTeX."""
+
+    def __init__(self, *text, font_size=DEFAULT_FONT_SIZE, color=WHITE, **kwargs):
+        content = "".join(str(t) for t in text)
+        super().__init__(
+            width=max(len(content), 1) * font_size * 0.006,
+            height=font_size * 0.012,
+            color=color,
+            stroke_width=0,
+        )
+        self.tex_string = content
+
+
+class DryRunMixin:
+    """Counts play/wait calls and tracks the number of mobjects on screen."""
+
+    def _reset_counters(self):
+        self.play_calls = 0
+        self.wait_calls = 0
+        self.animations = 0
+        self.peak_mobjects = 0
+        self._waiting = False
+
+    def play(self, *args, **kwargs):
+        if self._waiting:
+            self.wait_calls += 1
+        else:
+            self.play_calls += 1
+            self.animations += len(args)
+        super().play(*args, **kwargs)
+        self.peak_mobjects = max(self.peak_mobjects, len(self.get_mobject_family_members()))
+
+    def wait(self, *args, **kwargs):
+        self._waiting = True
+        try:
+            super().wait(*args, **kwargs)
+        finally:
+            self._waiting = False
@@ -1,25 +1,16 @@
 from manim import *
-import json
 import numpy as np
+from grouped_points import new_location_ids, open_reveal
+from lod import LODDots
+from projection import project
+
+# Scenario whose projects are revealed year by year
+SCENARIO = 0
 
 # Helper functions
-def load_data(file_path):
-    with open(file_path, "r") as f:
-        return json.load(f)
-
-def normalize_coordinates(lat, lon):
-    x = (lon + 125) / (125 - 66) * 10 - 5
-    y = (lat - 25) / (49 - 25) * 6 - 3
-    return np.array([x * 0.7 + 2, y * 0.7, 0])
-
-def create_dots_for_year(positions, all_points_set):
-    new_positions = [
-        normalize_coordinates(lat, lon)
-        for lat, lon in positions
-        if (lat, lon) not in all_points_set
-    ]
-    all_points_set.update((lat, lon) for lat, lon in positions)
-    return VGroup(*[Dot(pos, color="#E6E6FA", radius=0.05).set_opacity(0.3) for pos in new_positions])
+def create_dots_for_year(points, new_ids):
+    """Dots for the locations that appear for the first time this year, binned where they pile up."""
+    return LODDots(points[new_ids], color="#E6E6FA", radius=0.05, opacity=0.3, auto_update=False)
 
 def create_first_three_lines():
     """Create the first three lines of text."""
@@ -48,8 +39,7 @@ def create_title():
 class USMapDemandScenarios(Scene):
     def construct(self):
         # Load data
-        preprocessed_file = "grouped_points.json"
-        grouped_by_year = load_data(preprocessed_file)
+        reveal = open_reveal("grouped_points.bin", SCENARIO)
 
         # Create components
         first_three_lines = create_first_three_lines().shift(UP * 0.5)  # Shift text up slightly
@@ -75,14 +65,14 @@ class USMapDemandScenarios(Scene):
 
         # Plot points function
         def plot_points():
-            all_points_set = set()
+            points = project(reveal["locations"][:, 0], reveal["locations"][:, 1])
             all_points_group = VGroup()
             year_label_position = np.array([2.45, -2.75, 0])  # Fixed position beneath points
             previous_year_text = None
 
-            for year, positions in grouped_by_year.items():
-                new_dots = create_dots_for_year(positions, all_points_set)
-                year_text = Tex(f"\\textbf{{Scenario 0\\\\Year {year}}}", font_size=24).move_to(year_label_position)
+            for year in reveal["years"]:
+                new_dots = create_dots_for_year(points, new_location_ids(reveal, SCENARIO, year))
+                year_text = Tex(f"\\textbf{{Scenario {SCENARIO}\\\\Year {year}}}", font_size=24).move_to(year_label_position)
 
                 # Plot dots and year text
                 self.play(
@@ -1,36 +1,20 @@
 from manim import *
-import json
 import numpy as np
+from grouped_points import new_location_ids, open_reveal
+from lod import LODDots
+from projection import project
 
-def load_data(file_path):
-    with open(file_path, "r") as f:
-        return json.load(f)
+# Scenario whose projects are revealed year by year
+SCENARIO = 0
 
-def normalize_coordinates(lat, lon):
-    x = (lon + 125) / (125 - 66) * 10 - 5
-    y = (lat - 25) / (49 - 25) * 6 - 3
-    return np.array([x * 0.7 + 2, y * 0.7, 0])
-
-def create_dots_for_year(positions, all_points_set):
+def create_dots_for_year(points, new_ids):
     """
-    Creates Dot mobjects for positions that have not
-    yet appeared in all_points_set.
-    `positions` is expected to be a list of (lat, lon) pairs.
+    Creates Dot mobjects for the locations that appear for
+    the first time this year. `points` holds the projected
+    position of every location ID of the reveal. Crowded
+    areas are drawn as binned dots (see lod.LODDots).
     """
-    new_positions = []
-    for entry in positions:
-        # We assume these are just (lat, lon)
-        if len(entry) >= 2:
-            lat, lon = entry[:2]
-            # Only add if not already in our set
-            if (lat, lon) not in all_points_set:
-                new_positions.append(normalize_coordinates(lat, lon))
-                all_points_set.add((lat, lon))
-
-    return VGroup(
-        *[Dot(pos, color="#E6E6FA", radius=0.03).set_opacity(0.5)
-          for pos in new_positions]
-    )
+    return LODDots(points[new_ids], color="#E6E6FA", radius=0.03, opacity=0.5, auto_update=False)
 
 def create_first_three_lines():
     return VGroup(
@@ -66,12 +50,13 @@ def filter_points_by_state(positions, state, all_points_set):
         if len(entry) == 3:
             lat, lon, current_state = entry
             if current_state == state and (lat, lon) not in all_points_set:
-                filtered_positions.append(normalize_coordinates(lat, lon))
+                filtered_positions.append((lat, lon))
                 all_points_set.add((lat, lon))
 
+    filtered_positions = np.array(filtered_positions, dtype=float).reshape(-1, 2)
     return VGroup(
         *[Dot(pos, color="#FFA07A", radius=0.05).set_opacity(0.5)
-          for pos in filtered_positions]
+          for pos in project(filtered_positions[:, 0], filtered_positions[:, 1])]
     )
 
 def plot_filtered_points(scene, grouped_by_year):
@@ -98,7 +83,7 @@ def plot_filtered_points(scene, grouped_by_year):
 
 class USMapDemandScenarios(ThreeDScene):
     def construct(self):
-        grouped_by_year = load_data("grouped_points.json")
+        reveal = open_reveal("grouped_points.bin", SCENARIO)
         first_three_lines = create_first_three_lines().shift(UP * 0.5)
         title = create_title()
 
@@ -118,13 +103,13 @@ class USMapDemandScenarios(ThreeDScene):
             return features_text
 
         def plot_points():
-            all_points_set = set()
+            points = project(reveal["locations"][:, 0], reveal["locations"][:, 1])
             all_points_group = VGroup()
             year_label_position = np.array([2.45, -2.75, 0])
             previous_year_text = None
-            for year, positions in grouped_by_year.items():
-                new_dots = create_dots_for_year(positions, all_points_set)
-                year_text = Tex(f"\\textbf{{Scenario 0\\\\Year {year}}}", font_size=24).move_to(year_label_position)
+            for year in reveal["years"]:
+                new_dots = create_dots_for_year(points, new_location_ids(reveal, SCENARIO, year))
+                year_text = Tex(f"\\textbf{{Scenario {SCENARIO}\\\\Year {year}}}", font_size=24).move_to(year_label_position)
                 self.play(
                     FadeIn(new_dots, run_time=1.5),
                     Write(year_text) if not previous_year_text else ReplacementTransform(previous_year_text, year_text),
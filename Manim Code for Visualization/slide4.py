@@ -1,6 +1,7 @@
 from manim import *
 import pandas as pd
 import numpy as np
+from projection import project_df
 
 def scenario_dfs(path):
     data = pd.read_csv(path)
@@ -14,11 +15,6 @@ def scenario_dfs(path):
     }
     return dfs
 
-def normalize_coordinates(lat, lon):
-    x = (lon + 125) / (125 - 66) * 10 - 5
-    y = (lat - 25) / (49 - 25) * 6 - 3
-    return np.array([x * 17.5, y * 17.5, 0])
-
 def filter_data(df, scenario=None, year=None, store=None):
     filtered = df.copy()
     if scenario is not None:
@@ -33,12 +29,12 @@ def dot(filtered_df, color="#E6E6FA", x_adjust=0, y_adjust=0, opacity=0.4, radiu
     return VGroup(
         *[
             Dot(
-                normalize_coordinates(row.Lat, row.Lon) + np.array([x_adjust, y_adjust, 0]),
+                pos + np.array([x_adjust, y_adjust, 0]),
                 color=color,
                 radius=radius,
                 opacity=opacity
             ).set_opacity(opacity)
-            for _, row in filtered_df.iterrows()
+            for pos in project_df(filtered_df, "metro")
         ]
     )
 
@@ -48,8 +44,8 @@ def combined_df(scenario_data):
 def dot(filtered_df, color=WHITE, opacity=0.3, radius=0.05, shift=ORIGIN, rotation=-PI / 2):
     dots = VGroup(
         *[
-            Dot(normalize_coordinates(row.Lat, row.Lon), color=color, radius=radius).set_opacity(opacity)
-            for _, row in filtered_df.iterrows()
+            Dot(pos, color=color, radius=radius).set_opacity(opacity)
+            for pos in project_df(filtered_df, "metro")
         ]
     )
     return dots.move_to(shift).rotate_about_origin(rotation)
@@ -64,9 +60,14 @@ def create_dots_group(df, year, scenarios, color=BLUE, radius=0.03, opacity=0.8,
             dots_group.add(dots)
     return dots_group
 
+def year_indices(scenario_years, year):
+    """Per scenario row, the indices of the dots that open in `year`."""
+    return [np.flatnonzero(years == year) for years in scenario_years]
+
 class DisplayTransformations(ThreeDScene):
     def construct(self):
         df = pd.read_csv("Atlanta.csv")
+        scenario_years = [g["year"].to_numpy() for _, g in df.groupby("Scenario")]
         all_dots = VGroup()
         for i in range(5):
             df_i = filter_data(df, scenario=i)
@@ -86,21 +87,13 @@ class DisplayTransformations(ThreeDScene):
         year_label_position = centroid + 5.25 * DOWN
 
         for year in range(2025, 2031):
+            opened = year_indices(scenario_years, year)
             year_text = Tex(f"\\textbf{{Year {year}}}", font_size=26, color=YELLOW).move_to(year_label_position)
-            new_dots = VGroup(
-                *[
-                    dots[i]
-                    for dots, (_, scenario_data) in zip(all_dots, df.groupby("Scenario"))
-                    for i, (_, row) in enumerate(scenario_data.iterrows())
-                    if row["year"] == year
-                ]
-            )
             self.play(
                 *[
                     dots[i].animate.set_color(YELLOW).set_opacity(0.5)
-                    for dots, (_, scenario_data) in zip(all_dots, df.groupby("Scenario"))
-                    for i, (_, row) in enumerate(scenario_data.iterrows())
-                    if row["year"] == year
+                    for dots, indices in zip(all_dots, opened)
+                    for i in indices
                 ],
                 Write(year_text) if not previous_year_text else ReplacementTransform(previous_year_text, year_text),
                 run_time=1
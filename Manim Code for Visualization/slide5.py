@@ -1,15 +1,12 @@
 from manim import *
 import pandas as pd
 import numpy as np
+from projection import project_df
 import random
+from batched_highlight import HighlightSweep, color_style, pad_index
 
 LAVENDER = YELLOW
 
-def normalize_coordinates(lat, lon):
-    x = (lon + 125) / (125 - 66) * 10 - 5
-    y = (lat - 25) / (49 - 25) * 6 - 3
-    return np.array([x * 17.5, y * 17.5, 0])
-
 def filter_data(df, scenario=None, year=None, store=None):
     filtered = df.copy()
     if scenario is not None:
@@ -23,12 +20,21 @@ def filter_data(df, scenario=None, year=None, store=None):
 def dot(filtered_df, color=WHITE, opacity=0.3, radius=0.05, shift=ORIGIN, rotation=-PI / 2):
     dots = VGroup(
         *[
-            Dot(normalize_coordinates(row.Lat, row.Lon), color=color, radius=radius).set_opacity(opacity)
-            for _, row in filtered_df.iterrows()
+            Dot(pos, color=color, radius=radius).set_opacity(opacity)
+            for pos in project_df(filtered_df, "metro")
         ]
     )
     return dots.move_to(shift).rotate_about_origin(rotation)
 
+def store_caption(store_data):
+    """Bottom caption shown while a store index is highlighted."""
+    return Tex(
+        rf"\textbf{{{store_data['Banner'].replace('&', r'\&')}}}, "
+        rf"Rooms: \textbf{{{store_data['Project Rooms']}}}, "
+        "Date: Miscellaneous",
+        font_size=24
+    ).to_edge(DOWN)
+
 def process_points_across_scenarios(scene, df, all_dots, matrix):
     """
     Gradually animate whether each point is "kept" (high opacity, blue) or "excluded"
@@ -92,8 +98,10 @@ def highlight_points_and_matrix_by_sorted_store(
     """
     - If keep==True => bounding boxes + short date in cell + bottom text (Rooms, Banner, Month dd, yyyy).
     - If keep==False => bounding boxes + "0" in cell + bottom text "---".
+    All steps are played as one HighlightSweep.
     """
     previous_store_info = None
+    steps = []  # (dot, cell, cell_text, store_info) per step
 
     # Precompute store index mapping for efficiency
     store_index_map = {store_no: idx for idx, store_no in enumerate(sorted_store_numbers)}
@@ -118,9 +126,6 @@ def highlight_points_and_matrix_by_sorted_store(
             dot_obj = all_dots[scenario_index][store_index]
             cell = matrix[scenario_index][store_index]
 
-            dot_box = SurroundingRectangle(dot_obj, color=BLUE, buff=0.1)
-            cell_box = SurroundingRectangle(cell, color=BLUE, buff=0.1)
-
             # "0" or "mm.yy" in the cell
             if keep:
                 date_val = pd.to_datetime(df_row.iloc[0]["Ops Est Open"])
@@ -147,28 +152,21 @@ def highlight_points_and_matrix_by_sorted_store(
                     font_size=24
                 ).to_edge(DOWN)
 
-            # Animate bounding boxes, cell text, and bottom text together
-            if previous_store_info is None:
-                scene.play(
-                    Create(dot_box),
-                    Create(cell_box),
-                    Write(cell_text),
-                    Write(store_info),
-                    run_time=1
-                )
-            else:
-                scene.play(
-                    Create(dot_box),
-                    Create(cell_box),
-                    Write(cell_text),
-                    ReplacementTransform(previous_store_info, store_info),
-                    run_time=1
-                )
-
-            previous_store_info = store_info
-
-            # Fade out bounding boxes, keep cell text and bottom text
-            scene.play(FadeOut(dot_box), FadeOut(cell_box), run_time=0.5)
+            steps.append((dot_obj, cell, cell_text, store_info))
+
+    if steps:
+        step_index = np.arange(len(steps))[:, None]
+        sweep = HighlightSweep(
+            [step[0] for step in steps],
+            [step[1] for step in steps],
+            step_index,
+            step_index,
+            captions=[step[3] for step in steps],
+            reveals=[step[2] for step in steps],
+            timing=(1.0, 0.0, 0.5, 0.0),
+        )
+        scene.play(sweep)
+        previous_store_info = sweep.caption_holder
 
     # Fade out the last store info
     if previous_store_info:
@@ -238,77 +236,38 @@ class YearlyVisualization(Scene):
         self.play(all_dots.animate.set_opacity(0.1))
 
         # 3) Highlight each store index 'j' (original logic)
-        for j in range(store_count):
-            store_data = df.iloc[j]  # (This is just the j-th row in df)
-            store_info = Tex(
-                rf"\textbf{{{store_data['Banner'].replace('&', r'\&')}}}, "
-                rf"Rooms: \textbf{{{store_data['Project Rooms']}}}, "
-                "Date: Miscellaneous",
-                font_size=24
-            ).to_edge(DOWN)
-
-            highlight_dots = [
-                dots[k].animate.set_color(LAVENDER).set_opacity(1)
-                for dots in all_dots
-                for k in range(len(dots))
-                if k == j
-            ]
-            highlight_cells = [
-                row[j].animate.set_stroke(LAVENDER, opacity=1).set_fill(LAVENDER, opacity=0.5)
-                for row in matrix
-            ]
-            dot_positions = [
-                dots[k].get_center()
-                for dots in all_dots
-                for k in range(len(dots))
-                if k == j
-            ]
-            dots_bounding_box = SurroundingRectangle(
-                VGroup(*[Dot(pos) for pos in dot_positions]), color=BLUE, buff=0.2
-            )
-            cell_positions = [
-                row[j].get_center()
-                for row in matrix
-            ]
-            cells_bounding_box = SurroundingRectangle(
-                VGroup(*[Dot(pos) for pos in cell_positions]), color=BLUE, buff=0.2
-            )
-
-            if not previous_store_info:
-                self.play(
-                    *highlight_dots,
-                    *highlight_cells,
-                    Create(dots_bounding_box, run_time=1, rate_func=lambda t: t**2),
-                    Create(cells_bounding_box, run_time=1, rate_func=lambda t: t**2),
-                    Write(store_info),
-                )
-            else:
-                self.play(
-                    *highlight_dots,
-                    *highlight_cells,
-                    Create(dots_bounding_box, run_time=1, rate_func=lambda t: t**2),
-                    Create(cells_bounding_box, run_time=1, rate_func=lambda t: t**2),
-                    ReplacementTransform(previous_store_info, store_info),
-                )
-
-            previous_store_info = store_info
-            self.wait(0.1)
-            self.play(
-                FadeOut(dots_bounding_box, run_time=1.5),
-                FadeOut(cells_bounding_box, run_time=1.5),
-            )
-
-            reset_dots = [
-                dots[k].animate.set_color(WHITE).set_opacity(0.1)
-                for dots in all_dots
-                for k in range(len(dots))
-                if k == j
-            ]
-            reset_cells = [
-                row[j].animate.set_fill(WHITE, opacity=0.1).set_stroke(WHITE, opacity=1)
-                for row in matrix
-            ]
-            self.play(*reset_dots, *reset_cells, run_time=0.2)
+        # One sweep over index arrays: per store, highlight its dot in every
+        # scenario and its column of cells, box both, then reset them
+        flat_dots = [d for dots in all_dots for d in dots]
+        flat_cells = [cell for row in matrix for cell in row]
+        dot_offsets = np.cumsum([0] + [len(dots) for dots in all_dots])
+        dot_index = pad_index([
+            [dot_offsets[i] + j for i, dots in enumerate(all_dots) if j < len(dots)]
+            for j in range(store_count)
+        ])
+        cell_index = np.arange(store_count)[:, None] + store_count * np.arange(len(matrix))[None, :]
+        sweep = HighlightSweep(
+            flat_dots,
+            flat_cells,
+            dot_index,
+            cell_index,
+            captions=[store_caption(df.iloc[j]) for j in range(store_count)],
+            dot_styles=(color_style(LAVENDER, 1), color_style(WHITE, 0.1)),
+            cell_styles=(
+                {"stroke_color": LAVENDER, "stroke_opacity": 1, "fill_color": LAVENDER, "fill_opacity": 0.5},
+                {"fill_color": WHITE, "fill_opacity": 0.1, "stroke_color": WHITE, "stroke_opacity": 1},
+            ),
+            timing=(1.0, 0.1, 1.5, 0.2),
+            # Boxes as wide as a 0.2-buff SurroundingRectangle of default Dot markers
+            box_buff=(0.28 - 0.05, 0.28 - cell_width / 2),
+            box_rate=lambda t: t**2,
+        )
+        self.play(sweep)
+        previous_store_info = sweep.caption_holder
+        reset_cells = [
+            row[store_count - 1].animate.set_fill(WHITE, opacity=0.1).set_stroke(WHITE, opacity=1)
+            for row in matrix
+        ]
 
         self.play(FadeOut(previous_store_info))
 
@@ -1,22 +1,18 @@
 from manim import *
 import pandas as pd
 import numpy as np
-
-def normalize_coordinates(lat, lon):
-    # Normalize coordinates to fit into the scene's coordinate system
-    x = (lon + 125) / (125 - 66) * 10 - 5
-    y = (lat - 25) / (49 - 25) * 6 - 3
-    return np.array([x * 0.7 + 2, y * 0.7, 0])
+from projection import project
 
 def create_dots_for_year(positions, all_points_set):
     # Create new dots for unique latitude and longitude positions
-    new_positions = [
-        normalize_coordinates(lat, lon)
+    new_positions = np.array([
+        (lat, lon)
         for lat, lon in positions
         if (lat, lon) not in all_points_set
-    ]
+    ]).reshape(-1, 2)
     all_points_set.update((lat, lon) for lat, lon in positions)
-    return VGroup(*[Dot(pos, color="#E6E6FA", radius=0.02).set_opacity(0.4) for pos in new_positions])
+    points = project(new_positions[:, 0], new_positions[:, 1])
+    return VGroup(*[Dot(pos, color="#E6E6FA", radius=0.02).set_opacity(0.4) for pos in points])
 
 def filter_data(df, scenario):
     # Filter data for a specific scenario
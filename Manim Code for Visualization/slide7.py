@@ -1,11 +1,17 @@
 from manim import *
 import pandas as pd
 import random
+from projection import project
+from prefetch import Prefetcher
 
 # Define cell dimensions
 CELL_WIDTH = 0.7
 CELL_HEIGHT = 0.4
 
+# Prepare the later steps' sorted and edited frames in the background while
+# the earlier steps animate; the mobjects are still built on this thread
+PREFETCH = True
+
 class ReferenceMatrix(Scene):
 
     
@@ -28,6 +34,18 @@ class ReferenceMatrix(Scene):
                 d.at[d.index[i], "State/Province"] = "0"
         return d
 
+    def step_frames(self, df):
+        """
+        Data of steps 1-6: the three sort orders, then states replaced by
+        dates and some dates zeroed. Pure pandas, no mobjects.
+        """
+        data1 = df.sort_values(["Scenario", "Store No."])
+        data2 = df.sort_values(["Scenario", "State/Province"])
+        data3 = df.sort_values(["Scenario", "State/Province", "Lat"])
+        data_dates = self.replace_state_with_dates(data3)
+        data_zeroed = self.random_zero_dates(data_dates, p=0.35)  # 35% chance to become '0' for demonstration
+        return data1, data2, data3, data_dates, data_zeroed
+
     def create_reference_matrix(self, df, add_markers=False, max_display=12):
         """
         Create the reference matrix with optional markers.
@@ -365,21 +383,18 @@ class ReferenceMatrix(Scene):
     def construct(self):
         # Load your DataFrame
         df = pd.read_csv("output_with_metropolitan.csv")
-        def normalize_coordinates(lat, lon):
-            # Normalize coordinates to fit into the scene's coordinate system
-            x = (lon + 125) / (125 - 66) * 10 - 5
-            y = (lat - 25) / (49 - 25) * 6 - 3
-            return np.array([x * 0.7 + 2, y * 0.7, 0])
-
+        prefetch = Prefetcher(PREFETCH)
+        frames = prefetch.submit(self.step_frames, df)
         def create_dots_for_year(positions, all_points_set):
             # Create new dots for unique latitude and longitude positions
-            new_positions = [
-                normalize_coordinates(lat, lon)
+            new_positions = np.array([
+                (lat, lon)
                 for lat, lon in positions
                 if (lat, lon) not in all_points_set
-            ]
+            ]).reshape(-1, 2)
             all_points_set.update((lat, lon) for lat, lon in positions)
-            return VGroup(*[Dot(pos, color="#E6E6FA", radius=0.02).set_opacity(0.4) for pos in new_positions])
+            points = project(new_positions[:, 0], new_positions[:, 1])
+            return VGroup(*[Dot(pos, color="#E6E6FA", radius=0.02).set_opacity(0.4) for pos in points])
 
         def filter_data(df, scenario):
             # Filter data for a specific scenario
@@ -402,7 +417,7 @@ class ReferenceMatrix(Scene):
 
 
         # STEP 1: Reference matrix sorted by Scenario and Store No.
-        data1 = df.sort_values(["Scenario", "Store No."])
+        data1, data2, data3, data_dates, data_zeroed = frames.result()
         r1, lab1, mk1, lb1, rb1 = self.create_reference_matrix(data1, add_markers=False)
         txt_ref = Tex("Reference =", font_size=18).next_to(r1, LEFT, buff=0.5)
         row_name = Tex("Scenario|Store", font_size=11).rotate(45*DEGREES, about_point=txt_ref.get_bottom())
@@ -421,7 +436,6 @@ class ReferenceMatrix(Scene):
         self.wait()
 
         # STEP 2: Sort by Scenario and State/Province with markers
-        data2 = df.sort_values(["Scenario", "State/Province"])
         r2, lab2, mk2, lb2, rb2 = self.create_reference_matrix(data2, add_markers=True)
         self.play(
             TransformMatchingShapes(r1, r2),
@@ -439,7 +453,6 @@ class ReferenceMatrix(Scene):
         self.wait(2)
 
         # STEP 3: Sort by Scenario, State/Province, then Lat
-        data3 = df.sort_values(["Scenario", "State/Province", "Lat"])
         r3, lab3, mk3, lb3, rb3 = self.create_reference_matrix(data3, add_markers=True)
         self.play(
             TransformMatchingShapes(r2, r3),
@@ -458,14 +471,12 @@ class ReferenceMatrix(Scene):
         self.wait(6)  # Pause after step 4
 
         # STEP 5: Replace states with dates and create cluster_dates
-        data_dates = self.replace_state_with_dates(data3)
         cluster_dates = self.create_cluster_matrix_rect_grid(data_dates, max_rows=8, max_cols=10)
         cluster_dates.move_to(cluster_states)
         self.play(TransformMatchingShapes(cluster_states, cluster_dates))
         self.wait(6)  # Pause after step 5
 
         # STEP 6: Replace some dates with zeros and create cluster_zeros
-        data_zeroed = self.random_zero_dates(data_dates, p=0.35)  # 35% chance to become '0' for demonstration
         cluster_zeros = self.create_cluster_matrix_rect_grid(data_zeroed, max_rows=8, max_cols=10)
         cluster_zeros.move_to(cluster_dates)
         self.play(TransformMatchingShapes(cluster_dates, cluster_zeros))
@@ -474,3 +485,4 @@ class ReferenceMatrix(Scene):
         # STEP 7: Highlight zeros, handle neighbors, and transform
         self.highlight_and_transform()
         self.wait(3)  # Final pause
+        prefetch.close()
@@ -0,0 +1,145 @@
+"""
+How stable is a K-means / K-medoids grouping of the scenarios?
+
+`stability` reruns the clustering over many seeds and bootstrap resamples in
+a process pool. Runs work on the deduplicated rows (clustering.dedup_rows), and
+a bootstrap resample only redraws the row multiplicities. As each run
+finishes, its labels are folded into
+- per reference cluster, the pairs of its scenarios the run sampled and kept
+  together, read off the run's contingency table against the reference,
+- its adjusted Rand index against the reference run (seed 0, all data),
+and then dropped, so no run's assignment is kept. Memory stays O(U + K^2)
+per run; no pairwise (U, U) matrix is ever built.
+
+Usage:
+    python stability.py output_with_metropolitan.csv --k 2 --seeds 20 --bootstraps 50
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from clustering import dedup_rows, kmeans, kmedoids
+from scenario_matrix import build_scenario_matrix, impute
+
+_worker = {}
+
+
+def _init_worker(X, weights, k, method):
+    _worker.update(X=X, weights=weights, k=k, method=method)
+
+
+def _cluster(X, weights, k, method, seed):
+    if method == "kmedoids":
+        return kmedoids(X, k, weights, seed)[0]
+    return kmeans(X, k, weights, seed)[0]
+
+
+def _run(seed, bootstrap):
+    """Labels of one run on the rows it sampled; -1 for rows left out."""
+    w = _worker
+    weights = w["weights"]
+    if bootstrap:
+        rng = np.random.default_rng(seed)
+        weights = rng.multinomial(int(weights.sum()), weights / weights.sum()).astype(float)
+    labels = np.full(len(w["X"]), -1)
+    sampled = weights > 0
+    labels[sampled] = _cluster(w["X"][sampled], weights[sampled], w["k"], w["method"], seed)
+    return labels, weights
+
+
+def adjusted_rand(a, b, weights=None):
+    """Adjusted Rand index of two labelings, each row counted `weights` times."""
+    w = np.ones(len(a)) if weights is None else np.asarray(weights, dtype=float)
+    _, a = np.unique(a, return_inverse=True)
+    _, b = np.unique(b, return_inverse=True)
+    table = np.zeros((a.max() + 1, b.max() + 1))
+    np.add.at(table, (a.ravel(), b.ravel()), w)
+
+    def pairs(x):
+        return (x * (x - 1) / 2).sum()
+
+    n = w.sum()
+    index = pairs(table)
+    row, col = pairs(table.sum(1)), pairs(table.sum(0))
+    expected = row * col / (n * (n - 1) / 2) if n > 1 else 0
+    best = (row + col) / 2
+    return 1.0 if best == expected else (index - expected) / (best - expected)
+
+
+def _cluster_pairs(reference, labels, weights, k):
+    """
+    Per reference cluster: (pairs of distinct scenarios the run put in one
+    cluster, pairs of distinct scenarios it sampled). Rows are distinct rows
+    standing for `weights` scenarios each; -1 labels were left out.
+    """
+    keep = labels >= 0
+    ref, w = reference[keep], weights[keep]
+    _, run = np.unique(labels[keep], return_inverse=True)
+    table = np.zeros((k, run.max() + 1))
+    np.add.at(table, (ref, run.ravel()), w)
+    # Scenario self-pairs; identical scenarios still count as pairs
+    self_pairs = np.bincount(ref, weights=w, minlength=k)
+    return (table**2).sum(1) - self_pairs, table.sum(1) ** 2 - self_pairs
+
+
+def stability(X, k, method="kmeans", seeds=20, bootstraps=50, workers=None):
+    """
+    Returns a dict with
+        reference   : labels of the seed-0 run, per scenario row
+        ari         : adjusted Rand index of every other run against it
+        cluster_stability : share of the pairs of distinct scenarios in each
+                      reference cluster that runs kept together, among runs
+                      that sampled both; NaN for single-scenario clusters
+    """
+    unique, weights, inverse = dedup_rows(np.asarray(X))
+    unique = unique.astype(float)
+    weights = weights.astype(float)
+    reference = _cluster(unique, weights, k, method, 0)
+
+    n_clusters = reference.max() + 1
+    pairs_together, pairs_sampled = _cluster_pairs(reference, reference, weights, n_clusters)
+    ari = []
+    jobs = [(seed, False) for seed in range(1, seeds)] + [(seed, True) for seed in range(bootstraps)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(unique, weights, k, method)) as pool:
+        for future in as_completed([pool.submit(_run, *job) for job in jobs]):
+            labels, run_weights = future.result()
+            keep = labels >= 0
+            kept, drawn = _cluster_pairs(reference, labels, weights, n_clusters)
+            pairs_together += kept
+            pairs_sampled += drawn
+            ari.append(adjusted_rand(reference[keep], labels[keep], run_weights[keep]))
+
+    per_cluster = np.divide(pairs_together, pairs_sampled, out=np.full(n_clusters, np.nan),
+                            where=pairs_sampled > 0)
+    return {
+        "reference": reference[inverse],
+        "ari": np.array(ari),
+        "cluster_stability": per_cluster,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clustering stability over seeds and bootstraps.")
+    parser.add_argument("csv")
+    parser.add_argument("--k", type=int, default=2)
+    parser.add_argument("--method", choices=["kmeans", "kmedoids"], default="kmeans")
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--bootstraps", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    X = impute(build_scenario_matrix(pd.read_csv(args.csv)))
+    report = stability(X, args.k, args.method, args.seeds, args.bootstraps, args.workers)
+    ari = report["ari"]
+    print(f"ARI against the reference run: mean {ari.mean():.3f}, min {ari.min():.3f} "
+          f"over {len(ari)} runs")
+    for c, s in enumerate(report["cluster_stability"]):
+        print(f"    cluster {c}: {np.sum(report['reference'] == c)} scenarios, stability {s:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Static PNG/SVG export of reduction results.
+
+Two entry points:
+- `export_scene_frame` renders only the final state of a slide scene
+  (manim's save_last_frame: every animation is skipped, one frame is drawn).
+- `scenario_map`, `cluster_matrix` and `kmeans_groups` build result views
+  straight from pipeline arrays and `draw` paints them with cairo, so a batch
+  of hundreds of regions or K values needs neither manim scenes nor LaTeX.
+
+`export_batch` runs either kind of job in a process pool.
+
+Usage:
+    python static_export.py regions output_with_metropolitan.csv out_dir --format svg
+    python static_export.py scenes out_dir
+"""
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cairo
+import numpy as np
+import pandas as pd
+
+from projection import project
+
+# Scene frame of manim's default camera, in scene units
+FRAME_WIDTH = 14.222
+FRAME_HEIGHT = 8.0
+BACKGROUND = "#000000"
+DOT_COLOR = "#E6E6FA"
+PALETTE = ["#83C167", "#FC6255", "#58C4DD", "#FFFF00", "#9A72AC", "#F0AC5F", "#C55F73", "#5CD0B3"]
+
+
+def _rgba(color, opacity=1.0):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) / 255 for i in (0, 2, 4)) + (opacity,)
+
+
+def _palette(labels):
+    return [PALETTE[int(label) % len(PALETTE)] for label in labels]
+
+
+def scenario_map(lat, lon, labels=None, frame="national", radius=0.03, opacity=0.6, title=None):
+    """Dots for every project, colored by cluster label when given."""
+    points = project(lat, lon, frame)
+    colors = _palette(labels) if labels is not None else [DOT_COLOR] * len(points)
+    return {
+        "circles": np.column_stack([points[:, :2], np.full(len(points), radius)]),
+        "circle_colors": [_rgba(c, opacity) for c in colors],
+        "title": title,
+    }
+
+
+def cluster_matrix(values, labels, width=10.0, height=6.0, title=None):
+    """
+    Scenario x project matrix with rows grouped by cluster. `values` holds
+    opening months (0 where the project does not happen), as in slide7's grid.
+    """
+    values = np.asarray(values, dtype=float)
+    labels = np.asarray(labels)
+    order = np.argsort(labels, kind="stable")
+    values, labels = values[order], labels[order]
+
+    # Brighter cells open later; absent projects stay dark
+    nonzero = values[values > 0]
+    lo, hi = (nonzero.min(), nonzero.max()) if len(nonzero) else (0.0, 1.0)
+    shade = np.where(values > 0, 0.35 + 0.65 * (values - lo) / max(hi - lo, 1e-9), 0.08)
+    image = np.zeros(values.shape + (4,))
+    image[..., :3] = shade[..., None]
+    image[..., 3] = 1.0
+
+    # Bands marking where each cluster's rows start and end
+    x0, y0 = -width / 2, height / 2
+    row_h = height / len(values)
+    bounds = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1], True])
+    rects = []
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        rects.append((x0 - 0.25, y0 - b * row_h, 0.15, (b - a) * row_h, PALETTE[int(labels[a]) % len(PALETTE)]))
+    return {
+        "image": image,
+        "image_box": (x0, y0 - height, width, height),
+        "rects": rects,
+        "title": title,
+    }
+
+
+def kmeans_groups(lat, lon, scenario, labels, frame="national", radius=0.02, title=None):
+    """
+    Slide5's K-means view: one small map per scenario stacked top to bottom,
+    grouped by cluster, with a colored box around each group. `labels` holds
+    one cluster per scenario, in `np.unique(scenario)` order.
+    """
+    scenario = np.asarray(scenario)
+    ids = np.unique(scenario)
+    labels = np.asarray(labels)
+    by_label = np.argsort(labels, kind="stable")
+    sorted_labels = labels[by_label]
+    n = len(ids)
+    row = np.empty(scenario.max() + 1, dtype=int)
+    row[ids[by_label]] = np.arange(n)
+
+    # Squeeze the map of every scenario into a row of equal height
+    points = project(lat, lon, frame)[:, :2]
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    unit = (points - lo) / np.maximum(hi - lo, 1e-9)
+    top = FRAME_HEIGHT / 2 - 0.75
+    band = (FRAME_HEIGHT - 1.5) / max(n, 1)
+    row_width = 6.0
+    cx = -row_width / 2 + unit[:, 0] * row_width
+    cy = top - (row[scenario] + 0.5) * band + (unit[:, 1] - 0.5) * band * 0.8
+
+    rects = []
+    bounds = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1], True])
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        rects.append((-row_width / 2 - 0.1, top - b * band, row_width + 0.2, (b - a) * band,
+                      PALETTE[int(sorted_labels[a]) % len(PALETTE)]))
+    return {
+        "circles": np.column_stack([cx, cy, np.full(len(cx), radius)]),
+        "circle_colors": [_rgba(DOT_COLOR, 0.7)] * len(cx),
+        "rects": rects,
+        "title": title,
+    }
+
+
+VIEWS = {"scenario_map": scenario_map, "cluster_matrix": cluster_matrix, "kmeans_groups": kmeans_groups}
+
+
+def _paint_image(ctx, image, box):
+    # Upload the RGBA array once and let cairo scale it with nearest filtering
+    h, w = image.shape[:2]
+    rgba = (np.clip(image, 0, 1) * 255).astype(np.uint32)
+    argb = (rgba[..., 3] << 24) | (rgba[..., 0] << 16) | (rgba[..., 1] << 8) | rgba[..., 2]
+    stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_ARGB32, w)
+    data = np.zeros((h, stride // 4), dtype=np.uint32)
+    data[:, :w] = argb
+    surface = cairo.ImageSurface.create_for_data(memoryview(data), cairo.FORMAT_ARGB32, w, h, stride)
+
+    x, y, bw, bh = box
+    ctx.save()
+    ctx.translate(x, y + bh)
+    ctx.scale(bw / w, -bh / h)
+    ctx.set_source_surface(surface, 0, 0)
+    ctx.get_source().set_filter(cairo.FILTER_NEAREST)
+    ctx.rectangle(0, 0, w, h)
+    ctx.fill()
+    ctx.restore()
+    # The caller keeps the pixels alive until the surface is written
+    return data
+
+
+def draw(view, path, width=1920, height=1080):
+    """Paint a view to `path`; the suffix (.png or .svg) picks the format."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".svg":
+        surface = cairo.SVGSurface(str(path), width, height)
+    else:
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    ctx = cairo.Context(surface)
+    ctx.set_source_rgba(*_rgba(BACKGROUND))
+    ctx.paint()
+
+    # Work in scene units with y pointing up, like manim
+    ctx.translate(width / 2, height / 2)
+    ctx.scale(width / FRAME_WIDTH, -height / FRAME_HEIGHT)
+
+    pixels = None
+    if "image" in view:
+        pixels = _paint_image(ctx, view["image"], view["image_box"])
+    for (x, y, r), color in zip(view.get("circles", []), view.get("circle_colors", [])):
+        ctx.arc(x, y, r, 0, 2 * np.pi)
+        ctx.set_source_rgba(*color)
+        ctx.fill()
+    ctx.set_line_width(0.03)
+    for x, y, w, h, color in view.get("rects", []):
+        ctx.rectangle(x, y, w, h)
+        ctx.set_source_rgba(*_rgba(color))
+        ctx.stroke()
+    if view.get("title"):
+        ctx.save()
+        ctx.scale(1, -1)
+        ctx.set_source_rgba(*_rgba("#FFFFFF"))
+        ctx.set_font_size(0.3)
+        extents = ctx.text_extents(view["title"])
+        ctx.move_to(-extents.width / 2, -FRAME_HEIGHT / 2 + 0.6)
+        ctx.show_text(view["title"])
+        ctx.restore()
+
+    if path.suffix == ".svg":
+        surface.finish()
+    else:
+        surface.write_to_png(str(path))
+    del pixels
+    return str(path)
+
+
+def export_view(view_name, args, path, size=(1920, 1080)):
+    """Build one view from arrays and write it; runs inside the batch workers."""
+    return draw(VIEWS[view_name](**args), path, *size)
+
+
+def export_scene_frame(path, scene_name, quality="high_quality", media_dir="media"):
+    """Render only the final frame of a slide scene and return the PNG path."""
+    from manim import tempconfig
+
+    from render_all import SEED, load_scene_class
+
+    random.seed(SEED)
+    np.random.seed(SEED)
+    scene_cls = load_scene_class(path, scene_name)
+    options = {
+        "quality": quality,
+        "save_last_frame": True,
+        "write_to_movie": False,
+        "media_dir": str(Path(media_dir).resolve()),
+        "output_file": f"{Path(path).stem}_{scene_name}",
+        "progress_bar": "none",
+    }
+    with tempconfig(options):
+        scene = scene_cls()
+        scene.render()
+        return str(scene.renderer.file_writer.image_file_path)
+
+
+def _init_worker(data_dir):
+    if data_dir is not None:
+        os.chdir(data_dir)
+
+
+def export_batch(jobs, workers=None, data_dir=None):
+    """
+    Run export jobs in a process pool. A job is either
+    ("view", view_name, args, path) or ("scene", slide_path, scene_name).
+    Returns the written paths in job order.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(data_dir,)) as pool:
+        futures = []
+        for job in jobs:
+            if job[0] == "view":
+                futures.append(pool.submit(export_view, *job[1:]))
+            else:
+                futures.append(pool.submit(export_scene_frame, *job[1:]))
+        return [f.result() for f in futures]
+
+
+def region_jobs(df, out_dir, by="State/Province", scenario=None, labels=None, fmt="png"):
+    """One scenario_map job per region (state, metro flag, ...) of `df`."""
+    if scenario is not None:
+        df = df[df["Scenario"] == scenario]
+    jobs = []
+    for region, grp in df.groupby(by):
+        args = {"lat": grp["Lat"].to_numpy(), "lon": grp["Lon"].to_numpy(), "title": str(region)}
+        if labels is not None:
+            args["labels"] = labels[grp["Scenario"].to_numpy()]
+        name = str(region).replace("/", "_")
+        jobs.append(("view", "scenario_map", args, Path(out_dir) / f"{name}.{fmt}"))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export final frames and result views.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    regions = sub.add_parser("regions", help="one map per region of a scenario CSV")
+    regions.add_argument("csv")
+    regions.add_argument("out_dir")
+    regions.add_argument("--by", default="State/Province")
+    regions.add_argument("--scenario", type=int)
+    regions.add_argument("--format", choices=["png", "svg"], default="png")
+    scenes = sub.add_parser("scenes", help="final frame of every slide scene")
+    scenes.add_argument("out_dir")
+    scenes.add_argument("--data-dir", default=str(Path(__file__).resolve().parent))
+    for p in (regions, scenes):
+        p.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if args.command == "regions":
+        df = pd.read_csv(args.csv)
+        written = export_batch(region_jobs(df, args.out_dir, args.by, args.scenario, fmt=args.format),
+                               args.workers)
+    else:
+        from render_all import discover_scenes
+
+        jobs = [("scene", p, n, "high_quality", args.out_dir) for p, n in discover_scenes()]
+        written = export_batch(jobs, args.workers, args.data_dir)
+    print(f"Wrote {len(written)} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Out-of-core scenario reduction for scenario CSVs larger than memory.
+
+The CSV is read in chunks and never held whole:
+1. one pass collects the project columns (slide7's State/Province, Lat order),
+2. `n_epochs` passes build each chunk's month block, impute it and update a
+   mini-batch K-means (only the K centers and their counts are kept),
+3. a last pass assigns every scenario and picks each cluster's representative
+   (the scenario closest to its center).
+
+Peak memory is set by `chunksize`, not by the number of scenarios. Rows must
+be grouped by scenario, as the generator writes them; a scenario split across
+two chunks is carried over to the next one.
+
+Usage:
+    python streaming.py output_with_metropolitan.csv --k 10 --chunksize 200000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from clustering import assign, kmeans_plus_plus
+from scenario_matrix import fill_months, impute_rows, project_columns, state_segments
+
+COLUMNS = ["Scenario", "Store No.", "State/Province", "Lat", "Lon", "Ops Est Open"]
+
+
+def read_projects(path, chunksize=200_000):
+    """Project columns of a scenario CSV, gathered chunk by chunk."""
+    parts = []
+    for chunk in pd.read_csv(path, usecols=["Store No.", "State/Province", "Lat", "Lon"],
+                             chunksize=chunksize):
+        parts.append(chunk.drop_duplicates("Store No."))
+    return project_columns(pd.concat(parts, ignore_index=True))
+
+
+def scenario_blocks(path, projects, chunksize=200_000):
+    """Yield (scenarios, imputed months) for the complete scenarios of each chunk."""
+    stores = projects["Store No."].to_numpy()
+    lon = projects["Lon"].to_numpy(dtype=float)
+    segments = state_segments(projects["State/Province"].astype(str).to_numpy())
+    carry = None
+    for chunk in pd.read_csv(path, usecols=COLUMNS, chunksize=chunksize):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        # The last scenario may continue in the next chunk
+        last = chunk["Scenario"].iloc[-1]
+        carry = chunk[chunk["Scenario"] == last]
+        done = chunk[chunk["Scenario"] != last]
+        if len(done):
+            scenarios, months = fill_months(done, stores)
+            yield scenarios, impute_rows(months, lon, segments)
+    if carry is not None and len(carry):
+        scenarios, months = fill_months(carry, stores)
+        yield scenarios, impute_rows(months, lon, segments)
+
+
+class MiniBatchKMeans:
+    """
+    K-means updated one block at a time. Each center moves towards the mean
+    of the block rows assigned to it with a per-center rate of 1 / (rows
+    seen so far), so after one pass it is the running mean of its rows.
+
+    Blocks are buffered until they hold at least k rows, and the centers
+    are seeded (k-means++) from the buffer, so small blocks still give k
+    centers. `flush` seeds from whatever is buffered when the stream ends
+    first; only then can there be fewer than k centers.
+    """
+
+    def __init__(self, k, seed=0):
+        self.k = k
+        self.seed = seed
+        self.centers = None
+        self.counts = None
+        self._buffer = []
+
+    def partial_fit(self, X):
+        X = np.asarray(X, dtype=float)
+        if self.centers is None:
+            self._buffer.append(X)
+            if sum(len(b) for b in self._buffer) < self.k:
+                return self
+            return self.flush()
+        labels, _ = assign(X, self.centers)
+        n = np.bincount(labels, minlength=len(self.centers)).astype(float)
+        sums = np.zeros_like(self.centers)
+        np.add.at(sums, labels, X)
+        hit = n > 0
+        self.counts[hit] += n[hit]
+        self.centers[hit] += (sums[hit] - n[hit, None] * self.centers[hit]) / self.counts[hit, None]
+        return self
+
+    def flush(self):
+        """Seed the centers from the buffered rows and fit on them."""
+        if self.centers is not None or not self._buffer:
+            return self
+        X = np.concatenate(self._buffer)
+        self._buffer = []
+        self.centers = X[kmeans_plus_plus(X, min(self.k, len(X)), seed=self.seed)].copy()
+        self.counts = np.zeros(len(self.centers))
+        return self.partial_fit(X)
+
+    def predict(self, X):
+        return assign(np.asarray(X, dtype=float), self.centers)
+
+
+def stream_reduce(path, k, chunksize=200_000, n_epochs=1, seed=0):
+    """
+    Reduce the scenarios of a CSV to k clusters without loading it.
+
+    Returns a dict with
+        scenarios       : scenario numbers, in file order
+        labels          : cluster of each scenario
+        representatives : scenario number closest to each cluster center
+        probabilities   : share of scenarios in each cluster
+        cost            : sum of squared distances to the centers
+        centers         : (k, P) month-code centers
+        stores          : Store No. per center column
+    """
+    projects = read_projects(path, chunksize)
+    model = MiniBatchKMeans(k, seed)
+    for _ in range(n_epochs):
+        for _, X in scenario_blocks(path, projects, chunksize):
+            model.partial_fit(X)
+    # Fewer than k scenarios in the whole file: seed from all of them
+    model.flush()
+
+    k = len(model.centers)
+    best = np.full(k, np.inf)
+    representatives = np.full(k, -1, dtype=np.int64)
+    mass = np.zeros(k)
+    cost = 0.0
+    scenarios, labels = [], []
+    for ids, X in scenario_blocks(path, projects, chunksize):
+        lab, dist = model.predict(X)
+        scenarios.append(ids)
+        labels.append(lab)
+        mass += np.bincount(lab, minlength=k)
+        cost += dist.sum()
+        # Closest scenario of every cluster within this block
+        order = np.lexsort((dist, lab))
+        first = order[np.r_[True, lab[order][1:] != lab[order][:-1]]]
+        better = dist[first] < best[lab[first]]
+        best[lab[first][better]] = dist[first][better]
+        representatives[lab[first][better]] = ids[first][better]
+
+    return {
+        "scenarios": np.concatenate(scenarios) if scenarios else np.empty(0, dtype=np.int64),
+        "labels": np.concatenate(labels) if labels else np.empty(0, dtype=np.int64),
+        "representatives": representatives,
+        "probabilities": mass / max(mass.sum(), 1),
+        "cost": cost,
+        "centers": model.centers,
+        "stores": projects["Store No."].to_numpy(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster a scenario CSV chunk by chunk.")
+    parser.add_argument("csv")
+    parser.add_argument("--k", type=int, default=2)
+    parser.add_argument("--chunksize", type=int, default=200_000, help="CSV rows per chunk")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = stream_reduce(args.csv, args.k, args.chunksize, args.epochs, args.seed)
+    print(f"{len(result['scenarios'])} scenarios, cost {result['cost']:.4g}")
+    for c, (rep, p) in enumerate(zip(result["representatives"], result["probabilities"])):
+        print(f"    cluster {c}: scenario {rep}, probability {p:.3f}")
+
+
+if __name__ == "__main__":
+    main()
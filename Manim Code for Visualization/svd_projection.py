@@ -0,0 +1,79 @@
+"""
+Optional PCA stage between imputation and clustering.
+
+Each scenario is a 751-long vector of opening months; most of that variance
+lives in a few dozen directions. `PCAProjection` fits a randomized SVD
+(Halko, Martinsson & Tropp) once and projects rows in blocks, so K-means
+runs on short vectors. `explained_variance_ratio` says how much of the
+scenario spread the kept components cover.
+"""
+import numpy as np
+
+# Rows per block when projecting
+BATCH = 8192
+
+
+def randomized_svd(A, rank, n_oversamples=10, n_iter=4, seed=0):
+    """Truncated SVD of A via a randomized range finder. Returns (U, S, Vt)."""
+    rng = np.random.default_rng(seed)
+    m, n = A.shape
+    size = min(rank + n_oversamples, m, n)
+    Q = A @ rng.standard_normal((n, size))
+    # Power iterations with re-orthonormalization sharpen the spectrum
+    for _ in range(n_iter):
+        Q, _ = np.linalg.qr(Q)
+        Q, _ = np.linalg.qr(A.T @ Q)
+        Q = A @ Q
+    Q, _ = np.linalg.qr(Q)
+    U_small, S, Vt = np.linalg.svd(Q.T @ A, full_matrices=False)
+    return (Q @ U_small)[:, :rank], S[:rank], Vt[:rank]
+
+
+class PCAProjection:
+    """Centered projection onto the top `n_components` principal directions."""
+
+    def __init__(self, n_components=32, n_iter=4, seed=0):
+        self.n_components = n_components
+        self.n_iter = n_iter
+        self.seed = seed
+        self.mean = None
+        self.components = None
+        self.explained_variance = None
+        self.explained_variance_ratio = None
+
+    def fit(self, X, weights=None):
+        """
+        Fit on rows of X, each counted `weights` times (the multiplicities
+        from clustering.dedup_rows).
+        """
+        X = np.asarray(X, dtype=float)
+        w = np.ones(len(X)) if weights is None else np.asarray(weights, dtype=float)
+        self.mean = w @ X / w.sum()
+        # Scaling centered rows by sqrt(w) gives the weighted covariance
+        A = (X - self.mean) * np.sqrt(w / w.sum())[:, None]
+        rank = min(self.n_components, *A.shape)
+        _, S, Vt = randomized_svd(A, rank, n_iter=self.n_iter, seed=self.seed)
+        total = (A * A).sum()
+        self.components = Vt
+        self.explained_variance = S ** 2
+        self.explained_variance_ratio = self.explained_variance / total if total > 0 else np.zeros(rank)
+        return self
+
+    def transform(self, X):
+        """Project rows of X in blocks; returns float32 (N, n_components)."""
+        out = np.empty((len(X), len(self.components)), dtype=np.float32)
+        for start in range(0, len(X), BATCH):
+            block = np.asarray(X[start:start + BATCH], dtype=float)
+            out[start:start + BATCH] = (block - self.mean) @ self.components.T
+        return out
+
+    def fit_transform(self, X, weights=None):
+        return self.fit(X, weights).transform(X)
+
+    def summary(self):
+        """One line per component with its cumulative explained variance."""
+        cumulative = np.cumsum(self.explained_variance_ratio)
+        return "\n".join(
+            f"    component {i + 1:3d}: {r:6.2%}  (cumulative {c:6.2%})"
+            for i, (r, c) in enumerate(zip(self.explained_variance_ratio, cumulative))
+        )
@@ -0,0 +1,113 @@
+"""
+Synthetic stand-ins for the demand-scenario inputs the slides read.
+
+Writes output_with_metropolitan.csv, Atlanta.csv, grouped_points.json and
+grouped_points.bin with the same layout as the real files, for any number of
+scenarios and projects, so the data path can be load-tested without the
+generator's output.
+
+Usage:
+    python synthetic_data.py out_dir --scenarios 1000 --projects 751
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from grouped_points import build_reveal_from_df, write_reveal
+
+# Rough state centers (lat, lon) the projects are scattered around
+STATES = {
+    "GA": (32.9, -83.4), "FL": (28.6, -82.4), "TX": (31.5, -98.5), "CA": (36.8, -119.4),
+    "NY": (42.9, -75.5), "IL": (40.0, -89.2), "NC": (35.5, -79.4), "OH": (40.3, -82.8),
+    "PA": (40.9, -77.8), "AZ": (34.3, -111.7), "TN": (35.9, -86.4), "CO": (39.0, -105.5),
+}
+ATLANTA = (33.75, -84.39)
+ATLANTA_ZIPCODES = [30303, 30305, 30306, 30307, 30308, 30309, 30310, 30312, 30318, 30324, 30326]
+BANNERS = ["Home2 Suites", "Tru by Hilton", "Hampton Inn", "Candlewood & Staybridge", "Avid"]
+
+
+def make_projects(n_projects, rng):
+    """Project attributes that do not change between scenarios."""
+    names = list(STATES)
+    state = rng.choice(names, size=n_projects)
+    center = np.array([STATES[s] for s in state])
+    lat = center[:, 0] + rng.normal(0, 1.2, n_projects)
+    lon = center[:, 1] + rng.normal(0, 1.6, n_projects)
+    zipcode = rng.integers(10000, 99999, n_projects)
+
+    # A slice of the Georgia projects sits in metro Atlanta
+    atl = (state == "GA") & (rng.random(n_projects) < 0.4)
+    lat[atl] = ATLANTA[0] + rng.normal(0, 0.08, atl.sum())
+    lon[atl] = ATLANTA[1] + rng.normal(0, 0.08, atl.sum())
+    zipcode[atl] = rng.choice(ATLANTA_ZIPCODES, size=atl.sum())
+
+    return pd.DataFrame({
+        "Store No.": np.arange(1, n_projects + 1),
+        "Lat": lat.round(6),
+        "Lon": lon.round(6),
+        "State/Province": state,
+        "Zipcode": zipcode,
+        "Metropolitan": atl | (rng.random(n_projects) < 0.5),
+        "Project Rooms": rng.integers(60, 160, n_projects),
+        "Banner": rng.choice(BANNERS, size=n_projects),
+    })
+
+
+def make_scenarios(n_scenarios=50, n_projects=751, p_exist=0.8, seed=0):
+    """One row per (scenario, project that happens in it), like output_with_metropolitan.csv."""
+    rng = np.random.default_rng(seed)
+    projects = make_projects(n_projects, rng)
+
+    exists = rng.random((n_scenarios, n_projects)) < p_exist
+    scenario, project = np.nonzero(exists)
+    # Opening month within the 2025-2030 horizon, jittered per scenario
+    base_month = rng.integers(0, 72, n_projects)
+    month = np.clip(base_month[project] + rng.integers(-6, 7, len(project)), 0, 71)
+
+    df = projects.iloc[project].reset_index(drop=True)
+    df.insert(0, "Scenario", scenario)
+    opens = pd.Series(pd.Timestamp("2025-01-01") + pd.to_timedelta(month * 30.44, unit="D"))
+    df["Ops Est Open"] = opens.dt.strftime("%Y-%m-%d")
+    df["year"] = opens.dt.year
+    return df
+
+
+def grouped_points(df, scenario=0):
+    """{year: [[lat, lon], ...]} for one scenario, the grouped_points.json layout."""
+    sub = df[df["Scenario"] == scenario].sort_values("year")
+    return {
+        str(year): grp[["Lat", "Lon"]].to_numpy().tolist()
+        for year, grp in sub.groupby("year")
+    }
+
+
+def write_synthetic_inputs(directory, n_scenarios=50, n_projects=751, seed=0):
+    """Write all slide inputs into `directory` and return the scenario DataFrame."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    df = make_scenarios(n_scenarios, n_projects, seed=seed)
+    df.to_csv(directory / "output_with_metropolitan.csv", index=False)
+    atlanta = df[df["Zipcode"].isin(ATLANTA_ZIPCODES) & (df["State/Province"] == "GA")]
+    atlanta.to_csv(directory / "Atlanta.csv", index=False)
+    with open(directory / "grouped_points.json", "w") as f:
+        json.dump(grouped_points(df), f)
+    write_reveal(build_reveal_from_df(df), directory / "grouped_points.bin")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic slide inputs.")
+    parser.add_argument("directory")
+    parser.add_argument("--scenarios", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=751)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    df = write_synthetic_inputs(args.directory, args.scenarios, args.projects, args.seed)
+    print(f"Wrote {len(df)} rows to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
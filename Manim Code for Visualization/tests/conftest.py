@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules are flat scripts next to the slides, imported by name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scenario_matrix import build_scenario_matrix  # noqa: E402
+from synthetic_data import make_scenarios  # noqa: E402
+
+
+@pytest.fixture
+def scenario_df():
+    return make_scenarios(n_scenarios=60, n_projects=40, seed=1)
+
+
+@pytest.fixture
+def matrix(scenario_df):
+    return build_scenario_matrix(scenario_df)
+
+
+def _manim_stand_in():
+    """Just enough of manim to import the dry-run tools and run a scene without rendering."""
+    import contextlib
+    import types
+
+    manim = types.ModuleType("manim")
+
+    class Mobject:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class Scene:
+        def __init__(self, **kwargs):
+            self.mobjects = []
+
+        def add(self, *mobjects):
+            self.mobjects.extend(mobjects)
+
+        def play(self, *animations, **kwargs):
+            self.add(*animations)
+
+        def wait(self, *args, **kwargs):
+            pass
+
+        def get_mobject_family_members(self):
+            return list(self.mobjects)
+
+        def render(self):
+            self.construct()
+
+    manim.DEFAULT_FONT_SIZE = 48
+    manim.WHITE = "#FFFFFF"
+    manim.Mobject = manim.Rectangle = manim.Tex = Mobject
+    manim.Scene = Scene
+    manim.FadeIn = lambda mobject, **kwargs: mobject
+    manim.tempconfig = lambda options: contextlib.nullcontext()
+    return manim
+
+
+@pytest.fixture
+def manim():
+    """The installed manim, or a stand-in for it; modules importing it are re-imported."""
+    try:
+        import manim as module
+    except ImportError:
+        module = _manim_stand_in()
+    reimported = ("dry_run", "scene_probe", "benchmark")
+    saved = {name: sys.modules.pop(name) for name in reimported if name in sys.modules}
+    previous = sys.modules.get("manim")
+    sys.modules["manim"] = module
+    yield module
+    for name in list(sys.modules):
+        if name in reimported or name.startswith("_slides_"):
+            del sys.modules[name]
+    sys.modules.update(saved)
+    if previous is None:
+        del sys.modules["manim"]
+    else:
+        sys.modules["manim"] = previous
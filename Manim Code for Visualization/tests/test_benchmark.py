@@ -0,0 +1,50 @@
+from benchmark import compare, load_baselines, save_baselines
+
+METRICS = {"peak_mobjects": 100, "play_calls": 10, "wall_time": 2.0, "peak_rss_mb": 300.0}
+
+
+def test_growth_past_tolerance_is_a_regression():
+    baselines = {"slide4_X": {"50": METRICS}}
+    results = {"slide4_X": {"50": dict(METRICS, peak_mobjects=120, wall_time=2.5)}}
+    regressions, missing = compare(results, baselines)
+    assert regressions == [("slide4_X", "50", "peak_mobjects", 100, 120)]
+    assert missing == []
+
+
+def test_missing_baselines_are_reported_and_merged(tmp_path):
+    path = tmp_path / "baselines.json"
+    save_baselines({"slide4_X": {"50": METRICS}}, path)
+    results = {"slide4_X": {"200": METRICS}}
+    assert compare(results, load_baselines(path)) == ([], [("slide4_X", "200")])
+    save_baselines(results, path)
+    assert set(load_baselines(path)["slide4_X"]) == {"50", "200"}
+
+
+SCENE = """
+from manim import *
+import pandas as pd
+
+
+class Tiny(Scene):
+    def construct(self):
+        rows = pd.read_csv("rows.csv")
+        for _ in range(len(rows)):
+            self.play(FadeIn(Rectangle()))
+        self.wait()
+"""
+
+
+def test_bench_scene_renders_and_counts(manim, tmp_path, monkeypatch):
+    from benchmark import bench_scene
+
+    monkeypatch.chdir(tmp_path)
+    slide = tmp_path / "slide_tiny.py"
+    slide.write_text(SCENE)
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "rows.csv").write_text("a\n1\n2\n3\n")
+    metrics = bench_scene(slide, "Tiny", data_dir, tmp_path / "media")
+    assert metrics["play_calls"] == 3
+    assert metrics["peak_mobjects"] >= 3
+    assert metrics["wall_time"] >= 0
+    assert metrics["peak_rss_mb"] > 0
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from clustering import dedup_rows, inertia, kmeans, kmedoids, reduce_scenarios, silhouette
+from scenario_matrix import impute
+
+
+@pytest.fixture
+def duplicated(matrix):
+    """Scenario rows with repeats, shuffled, and their dedup_rows split."""
+    base = impute(matrix)[:15].astype(float)
+    rng = np.random.default_rng(0)
+    X = np.repeat(base, rng.integers(1, 5, len(base)), axis=0)
+    X = X[rng.permutation(len(X))]
+    return X, dedup_rows(X)
+
+
+def test_dedup_rows_round_trip(duplicated):
+    X, (unique, weights, inverse) = duplicated
+    np.testing.assert_array_equal(unique[inverse], X)
+    assert weights.sum() == len(X)
+    assert len(np.unique(unique, axis=0)) == len(unique)
+    # First-appearance order
+    assert np.all(np.diff([np.flatnonzero(inverse == u)[0] for u in range(len(unique))]) > 0)
+
+
+def test_weighted_kmeans_matches_full_rows(duplicated):
+    X, (unique, weights, inverse) = duplicated
+    init = unique[:3]
+    labels, centers, cost = kmeans(unique, 3, weights, init=init)
+    full_labels, full_centers, full_cost = kmeans(X, 3, init=init)
+    np.testing.assert_array_equal(labels[inverse], full_labels)
+    np.testing.assert_allclose(centers, full_centers)
+    assert np.isclose(cost, full_cost)
+    assert np.isclose(inertia(unique, labels, centers, weights), inertia(X, full_labels, full_centers))
+
+
+def test_weighted_kmedoids_matches_full_rows(duplicated):
+    X, (unique, weights, inverse) = duplicated
+    init = unique[:3]
+    labels, medoids, cost = kmedoids(unique, 3, weights, init=init)
+    full_labels, full_medoids, full_cost = kmedoids(X, 3, init=init)
+    np.testing.assert_array_equal(labels[inverse], full_labels)
+    np.testing.assert_array_equal(unique[medoids], X[full_medoids])
+    assert np.isclose(cost, full_cost)
+
+
+def test_weighted_silhouette_matches_full_rows(duplicated):
+    X, (unique, weights, inverse) = duplicated
+    labels, _, _ = kmeans(unique, 3, weights, init=unique[:3])
+    assert np.isclose(silhouette(unique, labels, weights), silhouette(X, labels[inverse]))
+
+
+def test_reduce_scenarios_maps_back_to_scenario_rows(duplicated):
+    X, (unique, weights, inverse) = duplicated
+    result = reduce_scenarios(X, 3)
+    assert result["n_unique"] == len(unique)
+    assert len(result["labels"]) == len(X)
+    assert np.isclose(result["probabilities"].sum(), 1)
+    # Each representative is a scenario row inside its own cluster; empty clusters have none
+    reps = result["representatives"]
+    filled = np.flatnonzero(result["probabilities"] > 0)
+    np.testing.assert_array_equal(np.flatnonzero(reps >= 0), filled)
+    np.testing.assert_array_equal(result["labels"][reps[filled]], filled)
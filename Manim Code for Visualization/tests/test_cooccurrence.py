@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from cooccurrence import BLOCK, cooccurrence, group_columns, pack_columns, phi_correlation, project_groups
+
+
+@pytest.fixture
+def exists():
+    # Scenario count not a multiple of 64, more projects than one block
+    return np.random.default_rng(0).random((150, BLOCK + 6)) < 0.4
+
+
+def test_pack_columns_keeps_every_bit(exists):
+    words = pack_columns(exists)
+    assert words.shape == (exists.shape[1], 3)
+    bits = np.unpackbits(words.view(np.uint8), axis=1)[:, :len(exists)]
+    np.testing.assert_array_equal(bits.T.astype(bool), exists)
+
+
+def test_cooccurrence_is_gram_matrix(exists):
+    E = exists.astype(np.int64)
+    np.testing.assert_array_equal(cooccurrence(exists), E.T @ E)
+
+
+def test_phi_matches_corrcoef(exists):
+    exists = exists.copy()
+    exists[:, 3] = True
+    exists[:, 5] = False
+    corr = phi_correlation(cooccurrence(exists), len(exists))
+    varying = np.setdiff1d(np.arange(exists.shape[1]), [3, 5])
+    np.testing.assert_allclose(corr[np.ix_(varying, varying)],
+                               np.corrcoef(exists[:, varying].T.astype(float)), atol=1e-12)
+    # Constant columns do not correlate with anything
+    assert not corr[[3, 5]].any() and not corr[:, [3, 5]].any()
+
+
+def test_identical_columns_are_grouped(exists):
+    base = exists[:, :4]
+    X = base[:, [0, 1, 2, 3, 0, 1, 2, 3, 0]]
+    groups = project_groups(phi_correlation(cooccurrence(X), len(X)), 4)
+    for c in range(4):
+        assert len(set(groups[c::4].tolist())) == 1
+    assert len(np.unique(groups)) == 4
+
+    means = group_columns(X, groups)
+    sums = group_columns(X, groups, reduce="sum")
+    for c in range(4):
+        np.testing.assert_array_equal(means[:, groups[c]], base[:, c])
+        np.testing.assert_array_equal(sums[:, groups[c]], base[:, c] * len(X[0, c::4]))
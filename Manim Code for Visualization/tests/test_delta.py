@@ -0,0 +1,57 @@
+import numpy as np
+
+from clustering import medoids_of, sq_distances
+from delta import DeltaReducer
+from scenario_matrix import impute_rows
+
+
+def check_matches_full_recompute(reducer):
+    X = impute_rows(reducer.months, reducer.lon, reducer.segments).astype(float)
+    np.testing.assert_array_equal(reducer.X, X)
+    mass = np.bincount(reducer.labels, minlength=reducer.k)
+    np.testing.assert_array_equal(reducer.mass, mass)
+    sums = np.zeros_like(reducer.centers)
+    np.add.at(sums, reducer.labels, X)
+    np.testing.assert_allclose(reducer.sums, sums, atol=1e-6)
+    filled = mass > 0
+    np.testing.assert_allclose(reducer.centers[filled], sums[filled] / mass[filled, None], atol=1e-6)
+    np.testing.assert_allclose(reducer.dist, sq_distances(X, reducer.centers), rtol=1e-6, atol=1e-3)
+    np.testing.assert_array_equal(reducer.labels, reducer.dist.argmin(1))
+    medoids = medoids_of(X, reducer.labels, reducer.k)
+    np.testing.assert_array_equal(reducer.medoids[filled], medoids[filled])
+
+
+def test_edits_match_full_recompute(matrix):
+    reducer = DeltaReducer(matrix, k=4)
+    rng = np.random.default_rng(0)
+    stores = matrix["stores"]
+    for _ in range(15):
+        store = stores[rng.integers(len(stores))]
+        rows = rng.choice(len(matrix["scenarios"]), size=10, replace=False)
+        codes = rng.integers(0, 400, size=10)
+        reducer.set_months(store, rows, codes)
+        check_matches_full_recompute(reducer)
+
+
+def test_slip_round_trip(matrix):
+    reducer = DeltaReducer(matrix, k=4)
+    months, X = reducer.months.copy(), reducer.X.copy()
+    store = matrix["stores"][5]
+    reducer.slip(store, 6)
+    assert not np.array_equal(reducer.X, X)
+    reducer.slip(store, -6)
+    np.testing.assert_array_equal(reducer.months, months)
+    np.testing.assert_array_equal(reducer.X, X)
+    check_matches_full_recompute(reducer)
+
+
+def test_repeated_rows_apply_once(matrix):
+    reducer = DeltaReducer(matrix, k=4)
+    twin = DeltaReducer(matrix, k=4)
+    store = matrix["stores"][7]
+    reducer.set_months(store, [3, 8, 3, 12, 8], [300, 310, 320, 330, 340])
+    twin.set_months(store, [3, 8, 12], [320, 340, 330])
+    check_matches_full_recompute(reducer)
+    np.testing.assert_array_equal(reducer.months, twin.months)
+    np.testing.assert_array_equal(reducer.labels, twin.labels)
+    np.testing.assert_allclose(reducer.sums, twin.sums)
@@ -0,0 +1,22 @@
+import types
+
+
+def test_dry_run_imports_and_times_phases(manim):
+    import dry_run
+
+    module = types.ModuleType("phases")
+
+    def inner():
+        return sum(range(1000))
+
+    def outer():
+        return inner() + inner()
+
+    for function in (inner, outer):
+        function.__module__ = module.__name__
+        setattr(module, function.__name__, function)
+
+    with dry_run.PhaseTimer(module) as timer:
+        outer()
+    assert timer.calls == {"inner": 2, "outer": 1}
+    assert timer.times["outer"] >= timer.times["inner"] > 0
@@ -0,0 +1,20 @@
+import numpy as np
+
+from features import FeatureBuilder
+
+
+def test_profile_is_mean_over_existing_projects(matrix):
+    blocks = FeatureBuilder(matrix).blocks
+    rooms = np.asarray(matrix["rooms"], dtype=float)
+    rooms = (rooms - rooms.mean()) / rooms.std()
+    for s in range(3):
+        happens = matrix["exists"][s]
+        assert np.isclose(blocks["rooms"][s, 0], rooms[happens].mean(), atol=1e-5)
+    # Each scenario's state shares sum to one
+    np.testing.assert_allclose(blocks["state"].sum(1), 1, atol=1e-5)
+
+
+def test_scenario_without_projects_has_zero_profile(matrix):
+    matrix = dict(matrix, exists=matrix["exists"].copy())
+    matrix["exists"][0] = False
+    assert not FeatureBuilder(matrix).blocks["lat"][0].any()
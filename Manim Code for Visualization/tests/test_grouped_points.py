@@ -0,0 +1,12 @@
+import numpy as np
+
+from grouped_points import build_reveal_from_df, open_reveal
+
+
+def test_missing_binary_is_built_from_the_csv(scenario_df, tmp_path):
+    scenario_df.to_csv(tmp_path / "output_with_metropolitan.csv", index=False)
+    reveal = open_reveal(tmp_path / "grouped_points.bin")
+    assert (tmp_path / "grouped_points.bin").exists()
+    expected = build_reveal_from_df(scenario_df)
+    for name, array in expected.items():
+        np.testing.assert_array_equal(reveal[name], array)
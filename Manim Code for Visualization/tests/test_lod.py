@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from lod import LODDots  # noqa: E402
+
+
+def test_zoom_switches_to_points():
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.normal(0, 0.02, (60, 2)), np.zeros(60)])
+    dots = LODDots(points, radius=0.03)
+    assert dots.level == "bins"
+    assert len(dots.submobjects) - 1 < len(points)
+
+    dots.scale(200)
+    dots.update()
+    assert dots.level == "points"
+    assert len(dots.submobjects) - 1 == len(points)
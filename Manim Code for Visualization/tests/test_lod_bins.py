@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from lod_bins import bin_points, cell_size_for, pick_level
+
+
+def test_bins_count_every_point():
+    rng = np.random.default_rng(0)
+    points = np.column_stack([rng.uniform(-7, 7, 500), rng.uniform(-4, 4, 500), np.zeros(500)])
+    centers, counts, bins = bin_points(points, 0.5)
+    assert counts.sum() == len(points)
+    np.testing.assert_array_equal(np.bincount(bins), counts)
+    # Every point shares its bin exactly with the points in the same grid cell
+    cells = np.floor(points[:, :2] / 0.5)
+    same_bin = bins[:, None] == bins[None]
+    same_cell = (cells[:, None] == cells[None]).all(axis=2)
+    np.testing.assert_array_equal(same_bin, same_cell)
+    for b in range(len(counts)):
+        np.testing.assert_allclose(centers[b], points[bins == b, :2].mean(axis=0))
+
+
+def test_cell_size_is_one_dot_diameter():
+    # slide1's 0.05 radius dots; two dots closer than a diameter overlap
+    size = cell_size_for(0.05)
+    assert size == pytest.approx(0.1)
+    _, counts, _ = bin_points(np.array([[0.01, 0.01], [0.09, 0.09], [0.11, 0.01]]), size)
+    assert sorted(counts.tolist()) == [1, 2]
+
+
+def test_level_switches_when_spread_out():
+    rng = np.random.default_rng(1)
+    cluster = rng.normal(0, 0.02, (50, 2))
+    size = cell_size_for(0.03)
+    level, centers, counts = pick_level(cluster, size, threshold=4)
+    assert level == "bins" and len(centers) < len(cluster)
+    # Scaled up around its center, as after a zoom, no bin is crowded any more
+    level, _, counts = pick_level(cluster * 200, size, threshold=4)
+    assert level == "points" and counts.max() <= 4
+    assert pick_level(np.empty((0, 2)), size, 4)[0] == "points"
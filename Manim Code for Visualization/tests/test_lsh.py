@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from clustering import medoids_of
+from lsh import MinHashIndex, ProjectionIndex, approximate_medoid, find_duplicates
+from scenario_matrix import impute
+
+# Injected (copy, original) rows
+COPIES = {40: 3, 41: 17, 42: 17, 43: 29}
+
+
+@pytest.fixture
+def X(matrix):
+    return impute(matrix)[:40].astype(float)
+
+
+def _with_copies(rows):
+    return np.concatenate([rows, rows[list(COPIES.values())]])
+
+
+def _exact_pairs(rows):
+    same = (rows[:, None] == rows[None]).all(axis=2)
+    return {(i, j) for i, j in zip(*np.nonzero(np.triu(same, 1)))}
+
+
+@pytest.mark.parametrize("kind", ["minhash", "projection"])
+def test_find_duplicates_recovers_injected_copies(kind, X, matrix):
+    if kind == "minhash":
+        rows = _with_copies(matrix["exists"][:40])
+        index = MinHashIndex(rows, n_hashes=64, bands=16)
+    else:
+        rows = _with_copies(X)
+        index = ProjectionIndex(rows)
+    found = {tuple(pair) for pair in find_duplicates(index).tolist()}
+    injected = {(original, copy) for copy, original in COPIES.items()} | {(41, 42)}
+    assert injected <= found
+    if kind == "projection":
+        assert found == _exact_pairs(rows)
+    else:
+        # Jaccard distance 0 on the signatures; every exactly equal bitset is in
+        assert _exact_pairs(rows) <= found
+
+
+def test_projection_nearest_and_within_match_brute_force(X):
+    # One bucket per table holds every row, so the candidates are all rows
+    index = ProjectionIndex(X, width=1e12)
+    d = np.sqrt(((X[:, None] - X[None]) ** 2).sum(axis=2))
+    for i in (0, 7, 23):
+        others = np.delete(np.arange(len(X)), i)
+        order = others[np.argsort(d[i, others], kind="stable")]
+        rows, dist = index.nearest(i, n=5)
+        np.testing.assert_array_equal(rows, order[:5])
+        np.testing.assert_allclose(dist, d[i, order[:5]])
+
+        r = np.median(d[i, others])
+        rows, dist = index.within(i, r)
+        np.testing.assert_array_equal(rows, others[d[i, others] <= r])
+        np.testing.assert_allclose(dist, d[i, rows])
+
+        rows, dist = index.query(X[i], n=1)
+        assert rows[0] == i and dist[0] == 0
+
+
+def test_projection_results_are_exact_distances(X):
+    index = ProjectionIndex(X, n_tables=4, n_projections=2)
+    rows, dist = index.nearest(0, n=10)
+    np.testing.assert_allclose(dist, np.sqrt(((X[rows] - X[0]) ** 2).sum(axis=1)))
+    assert np.all(np.diff(dist) >= 0)
+
+
+def test_minhash_nearest_and_within_match_brute_force(matrix):
+    exists = matrix["exists"][:40]
+    # One hash per band: two rows share a bucket exactly when they share a MinHash value
+    index = MinHashIndex(exists, n_hashes=64, bands=64)
+    sim = (index.signatures[:, None] == index.signatures[None]).mean(axis=2)
+    for i in (0, 11, 30):
+        others = np.delete(np.arange(len(exists)), i)
+        others = others[sim[i, others] > 0]
+        order = others[np.argsort(-sim[i, others], kind="stable")]
+        rows, similarity = index.nearest(i, n=5)
+        np.testing.assert_array_equal(rows, order[:5])
+        np.testing.assert_allclose(similarity, sim[i, order[:5]])
+
+        rows, distance = index.within(i, 0.5)
+        np.testing.assert_array_equal(rows, others[1 - sim[i, others] <= 0.5])
+        np.testing.assert_allclose(distance, 1 - sim[i, rows])
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_approximate_medoid_matches_exact(weighted, X):
+    members = np.arange(5, 25)
+    weights = np.random.default_rng(0).integers(1, 5, len(members)) if weighted else None
+    index = ProjectionIndex(X)
+    exact = members[medoids_of(X[members], np.zeros(len(members), dtype=int), 1, weights)[0]]
+    assert approximate_medoid(index, members, weights, n_candidates=len(members)) == exact
@@ -0,0 +1,23 @@
+import numpy as np
+
+from clustering import scenario_features
+from opening_curves import opening_curves
+
+
+def test_curves_match_counting_loop(matrix):
+    curves, states, month_codes = opening_curves(matrix)
+    weighted, _, _ = opening_curves(matrix, "rooms")
+    months, rooms = matrix["months"], np.asarray(matrix["rooms"], dtype=float)
+    for s in range(0, len(months), 7):
+        for g, state in enumerate(states):
+            cols = matrix["states"] == state
+            for m, code in enumerate(month_codes):
+                opened = cols & (months[s] > 0) & (months[s] <= code)
+                assert curves[s, g, m] == opened.sum()
+                assert np.isclose(weighted[s, g, m], rooms[opened].sum())
+
+
+def test_curve_features_are_flattened_curves(matrix):
+    curves, _, _ = opening_curves(matrix)
+    X = scenario_features(matrix, "curves")
+    np.testing.assert_array_equal(X, curves.reshape(len(curves), -1).astype(np.float32))
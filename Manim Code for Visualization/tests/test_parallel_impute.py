@@ -0,0 +1,12 @@
+import numpy as np
+
+from parallel_impute import parallel_impute
+from scenario_matrix import impute
+
+
+def test_parallel_impute_is_bit_identical(matrix):
+    # Small blocks so several workers each take a few row ranges
+    result = parallel_impute(matrix, workers=2, block_rows=7)
+    expected = impute(matrix)
+    assert result.dtype == expected.dtype
+    np.testing.assert_array_equal(result, expected)
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+import projection
+from projection import project, project_df
+
+
+def test_state_frame_puts_the_anchor_on_its_offset():
+    lat, lon = projection.FRAMES["state"]["anchor"]
+    np.testing.assert_allclose(project([lat], [lon], "state")[0], [0, 0.2, 0])
+
+
+def test_cache_is_bounded_and_keyed(monkeypatch):
+    monkeypatch.setattr(projection, "_cache", projection.OrderedDict())
+    df = pd.DataFrame({"Lat": [33.7, 40.7], "Lon": [-84.4, -74.0]})
+    for i in range(projection.CACHE_SIZE + 5):
+        project_df(df, key=("test", i))
+    assert len(projection._cache) == projection.CACHE_SIZE
+    project_df(df)
+    assert len(projection._cache) == projection.CACHE_SIZE
+    np.testing.assert_array_equal(project_df(df, "metro", key="a"), project(df["Lat"], df["Lon"], "metro"))
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from clustering import reduce_scenarios
+from query_service import start_server
+from reduced_export import reduced_arrays, write_reduced
+from scenario_matrix import impute
+
+
+@pytest.fixture
+def reduced(tmp_path, scenario_df, matrix):
+    arrays = reduced_arrays(scenario_df, matrix, reduce_scenarios(impute(matrix).astype(float), 3))
+    path = tmp_path / "reduced.bin"
+    write_reduced(arrays, path)
+    return path, arrays
+
+
+async def _get(port, target, method="GET"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), json.loads(body)
+
+
+def _serve(path, requests):
+    """Start the service on a free port and return (status, body) for each (target[, method])."""
+    async def run():
+        server = await start_server(path, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await _get(port, *request) for request in requests]
+
+    return asyncio.run(run())
+
+
+def test_routes(reduced):
+    path, arrays = reduced
+    scenario = int(arrays["member_scenario"][5])
+    cluster = int(arrays["member_cluster"][5])
+    state = str(arrays["state"][0])
+    responses = _serve(path, [
+        ("/clusters",),
+        (f"/cluster?scenario={scenario}",),
+        (f"/probability?cluster={cluster}",),
+        (f"/medoid?state={state}&cluster={cluster}",),
+        (f"/medoid?state={state}",),
+    ])
+    assert all(status == 200 for status, _ in responses)
+    clusters, member, probability, medoid, medoids = (body for _, body in responses)
+
+    assert clusters["k"] == len(arrays["scenario"])
+    np.testing.assert_allclose([c["probability"] for c in clusters["clusters"]], arrays["probability"])
+    assert member == {"scenario": scenario, "cluster": cluster,
+                      "representative": int(arrays["scenario"][cluster]),
+                      "probability": float(arrays["probability"][cluster])}
+    assert probability == {"cluster": cluster, "probability": float(arrays["probability"][cluster])}
+    assert [m["cluster"] for m in medoid["medoids"]] == [cluster]
+    in_state = arrays["state"] == state
+    happens = arrays["months"][cluster] > 0
+    assert {p["store"] for p in medoid["medoids"][0]["projects"]} == \
+        set(arrays["store_no"][in_state & happens].tolist())
+    assert len(medoids["medoids"]) == len(arrays["scenario"])
+
+
+def test_errors(reduced):
+    path, arrays = reduced
+    unknown = int(arrays["member_scenario"].max()) + 1
+    responses = _serve(path, [
+        ("/cluster",),
+        ("/cluster?scenario=abc",),
+        ("/probability?cluster=x",),
+        ("/medoid",),
+        (f"/cluster?scenario={unknown}",),
+        ("/probability?cluster=99",),
+        ("/medoid?state=ZZ",),
+        ("/nowhere",),
+        ("/clusters", "POST"),
+    ])
+    assert [status for status, _ in responses] == [400, 400, 400, 400, 404, 404, 404, 404, 405]
+    assert all("error" in body for _, body in responses)
@@ -0,0 +1,61 @@
+import numpy as np
+
+from clustering import reduce_scenarios
+from reduced_export import read_reduced, reduced_arrays, write_reduced
+from scenario_matrix import impute
+
+
+def test_representatives_index_the_matrix(scenario_df, matrix):
+    result = reduce_scenarios(impute(matrix).astype(float), 3)
+    arrays = reduced_arrays(scenario_df, matrix, result)
+    np.testing.assert_array_equal(arrays["scenario"], matrix["scenarios"][result["representatives"]])
+
+
+def test_empty_clusters_are_dropped_and_renumbered(scenario_df, matrix):
+    result = reduce_scenarios(impute(matrix).astype(float), 3)
+    labels = np.asarray(result["labels"])
+    # Cluster 1 lost all its members: they moved to cluster 3, the old cluster 1 is empty
+    result["labels"] = np.where(labels == 1, 3, labels)
+    result["representatives"] = np.r_[result["representatives"][[0]], -1,
+                                      result["representatives"][[2, 1]]]
+    probabilities = np.asarray(result["probabilities"])
+    result["probabilities"] = np.r_[probabilities[0], 0.0, probabilities[2], probabilities[1]]
+
+    arrays = reduced_arrays(scenario_df, matrix, result)
+    assert len(arrays["scenario"]) == 3
+    np.testing.assert_array_equal(arrays["member_cluster"], np.where(labels == 0, 0, np.where(labels == 2, 1, 2)))
+    np.testing.assert_allclose(arrays["probability"].sum(), 1.0)
+    np.testing.assert_array_equal(np.bincount(arrays["member_cluster"]) / len(labels), arrays["probability"])
+
+
+def test_missing_optional_columns(scenario_df, matrix):
+    result = reduce_scenarios(impute(matrix).astype(float), 3)
+    arrays = reduced_arrays(scenario_df.drop(columns=["Project Rooms", "Banner"]), matrix, result)
+    assert (arrays["rooms"] == 0).all()
+    assert (arrays["banner"] == "").all()
+    assert len(arrays["banner"]) == len(matrix["stores"])
+
+
+def test_write_read_round_trip(tmp_path, scenario_df, matrix):
+    result = reduce_scenarios(impute(matrix).astype(float), 4)
+    arrays = reduced_arrays(scenario_df, matrix, result)
+    path = tmp_path / "reduced.bin"
+    write_reduced(arrays, path)
+
+    loaded = read_reduced(path)
+    assert loaded.keys() == arrays.keys()
+    for name, arr in arrays.items():
+        assert loaded[name].dtype == arr.dtype
+        np.testing.assert_array_equal(loaded[name], arr)
+
+
+def test_read_column_subset(tmp_path, scenario_df, matrix):
+    result = reduce_scenarios(impute(matrix).astype(float), 4)
+    arrays = reduced_arrays(scenario_df, matrix, result)
+    path = tmp_path / "reduced.bin"
+    write_reduced(arrays, path)
+
+    loaded = read_reduced(path, ["probability", "months"])
+    assert list(loaded) == ["probability", "months"]
+    np.testing.assert_array_equal(loaded["probability"], arrays["probability"])
+    np.testing.assert_array_equal(loaded["months"], arrays["months"])
@@ -0,0 +1,22 @@
+import pytest
+
+from render_all import scene_sections, section_options, split_sections
+
+
+@pytest.mark.parametrize("n, sections", [(1, 3), (7, 3), (10, 4), (42, 5), (5, 5)])
+def test_sections_cover_every_animation_once(n, sections):
+    played = []
+    for section in split_sections(n, sections):
+        options = section_options(section)
+        played.extend(range(options["from_animation_number"], options["upto_animation_number"] + 1))
+    assert played == list(range(n))
+
+
+@pytest.mark.parametrize("n, sections", [(0, 4), (1, 4), (10, 1)])
+def test_unsplittable_scenes_render_whole(n, sections):
+    assert scene_sections(n, sections) == [None]
+
+
+def test_split_scenes_keep_their_ranges():
+    assert scene_sections(10, 4) == split_sections(10, 4)
+    assert split_sections(0, 4) == []
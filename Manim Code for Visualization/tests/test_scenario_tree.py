@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from scenario_matrix import build_scenario_matrix, month_code
+from scenario_tree import build_tree, stage_ends
+from synthetic_data import make_scenarios
+
+
+@pytest.fixture(scope="module", params=[None, [2026, 2027, 2030]])
+def tree(request):
+    matrix = build_scenario_matrix(make_scenarios(n_scenarios=60, n_projects=40, seed=1))
+    return build_tree(matrix, [3, 2, 2], years=request.param, workers=2), len(matrix["scenarios"])
+
+
+def test_children_split_their_parent(tree):
+    tree, _ = tree
+    for node in range(len(tree["parent"])):
+        children = np.flatnonzero(tree["parent"] == node)
+        if len(children):
+            assert np.isclose(tree["probability"][children].sum(), tree["probability"][node])
+            assert np.all(tree["stage"][children] == tree["stage"][node] + 1)
+
+
+def test_leaves_partition_the_scenarios(tree):
+    tree, n = tree
+    last = tree["stage"].max()
+    leaves = np.flatnonzero(tree["stage"] == last)
+    assert set(tree["leaf"].tolist()) <= set(leaves.tolist())
+    np.testing.assert_allclose(np.bincount(tree["leaf"], minlength=len(tree["parent"]))[leaves] / n,
+                               tree["probability"][leaves])
+    # A node's representative is one of its own scenarios
+    for node in range(1, len(tree["parent"])):
+        rep_leaf = tree["leaf"][tree["representative"][node]]
+        while tree["stage"][rep_leaf] > tree["stage"][node]:
+            rep_leaf = tree["parent"][rep_leaf]
+        assert rep_leaf == node
+
+
+def test_stage_ends_with_uneven_stages():
+    codes = month_code(["2025-01-01", "2025-06-01", "2027-03-01", "2027-04-01", "2030-12-01"])
+    assert stage_ends(codes, [2024, 2025, 2026, 2027, 2030, 2031]) == [0, 2, 2, 4, 5, 5]
+    assert stage_ends(codes, [2027]) == [4]
+    assert stage_ends([], [2025, 2026]) == [0, 0]
@@ -0,0 +1,32 @@
+import numpy as np
+
+from stability import _cluster_pairs, stability
+
+
+def test_cluster_pairs_match_pairwise_count():
+    rng = np.random.default_rng(0)
+    reference = rng.integers(0, 3, 30)
+    labels = rng.integers(-1, 4, 30)
+    weights = rng.integers(1, 4, 30).astype(float)
+    # Expand to one entry per scenario and count ordered pairs i != j
+    ref = np.repeat(reference, weights.astype(int))
+    lab = np.repeat(labels, weights.astype(int))
+    same_ref = (ref[:, None] == ref[None, :]) & ~np.eye(len(ref), dtype=bool)
+    sampled = same_ref & (lab[:, None] >= 0) & (lab[None, :] >= 0)
+    together = sampled & (lab[:, None] == lab[None, :])
+    kept, drawn = _cluster_pairs(reference, labels, weights, 3)
+    for c in range(3):
+        in_c = ref == c
+        assert kept[c] == together[np.ix_(in_c, in_c)].sum()
+        assert drawn[c] == sampled[np.ix_(in_c, in_c)].sum()
+
+
+def test_single_scenario_cluster_is_nan():
+    rng = np.random.default_rng(0)
+    X = np.vstack([rng.normal(0, 0.1, (20, 2)), rng.normal(5, 0.1, (20, 2)), [[100.0, 100.0]]])
+    report = stability(X, 3, seeds=3, bootstraps=3, workers=2)
+    singleton = report["reference"][-1]
+    assert np.sum(report["reference"] == singleton) == 1
+    assert np.isnan(report["cluster_stability"][singleton])
+    others = np.delete(report["cluster_stability"], singleton)
+    assert np.all((others > 0) & (others <= 1))
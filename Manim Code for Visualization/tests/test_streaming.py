@@ -0,0 +1,20 @@
+import numpy as np
+
+from streaming import MiniBatchKMeans, stream_reduce
+
+
+def test_small_chunks_still_give_k_centers(scenario_df, tmp_path):
+    path = tmp_path / "scenarios.csv"
+    scenario_df.to_csv(path, index=False)
+    # About one scenario per chunk, far fewer than k
+    result = stream_reduce(path, k=10, chunksize=50)
+    assert len(result["centers"]) == 10
+    assert len(result["scenarios"]) == scenario_df["Scenario"].nunique()
+    assert np.all(result["representatives"] >= 0)
+
+
+def test_fewer_rows_than_k_seeds_on_flush():
+    model = MiniBatchKMeans(k=5).partial_fit(np.arange(6.0).reshape(3, 2))
+    assert model.centers is None
+    model.flush()
+    assert len(model.centers) == 3
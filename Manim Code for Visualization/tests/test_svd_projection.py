@@ -0,0 +1,31 @@
+import numpy as np
+
+from clustering import dedup_rows
+from svd_projection import PCAProjection, randomized_svd
+
+
+def low_rank_rows(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(20, 3)) * [10, 5, 2] @ rng.normal(size=(3, 40)) + 100
+
+
+def test_randomized_svd_matches_exact_svd():
+    A = low_rank_rows()
+    A = A - A.mean(0)
+    _, S, Vt = randomized_svd(A, 3)
+    _, S_exact, Vt_exact = np.linalg.svd(A, full_matrices=False)
+    np.testing.assert_allclose(S, S_exact[:3], rtol=1e-8)
+    np.testing.assert_allclose(np.abs(Vt @ Vt_exact[:3].T), np.eye(3), atol=1e-8)
+
+
+def test_weighted_fit_matches_full_rows():
+    base = low_rank_rows()
+    X = np.repeat(base, np.random.default_rng(1).integers(1, 5, len(base)), axis=0)
+    unique, weights, _ = dedup_rows(X)
+    weighted = PCAProjection(3).fit(unique, weights)
+    full = PCAProjection(3).fit(X)
+    np.testing.assert_allclose(weighted.mean, full.mean)
+    np.testing.assert_allclose(weighted.explained_variance_ratio, full.explained_variance_ratio, rtol=1e-8)
+    # Same subspace, up to the sign of each component
+    np.testing.assert_allclose(np.abs(weighted.components @ full.components.T), np.eye(3), atol=1e-8)
+    np.testing.assert_allclose(np.abs(weighted.transform(X)), np.abs(full.transform(X)), rtol=1e-4, atol=1e-3)